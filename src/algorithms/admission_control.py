@@ -0,0 +1,147 @@
+import sys
+import os
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+import numpy as np
+from utils.logger import setup_logger
+from config.config import Config
+from algorithms.resource_allocation import ResourceAllocation
+
+class AdmissionControl:
+    def __init__(self, config, resource_allocator=None):
+        self.config = config
+        self.logger = setup_logger('AdmissionControlLogger', self.config.get('logging.log_file', 'logs/admission_control.log'))
+        self.resource_allocator = resource_allocator or ResourceAllocation(config=config)
+        self.max_utilization = self.config.get('admission_control.max_utilization', 0.99)
+        self.delay_budget = self.config.get('admission_control.delay_budget')
+        self.tolerance = self.config.get('admission_control.tolerance', 1e-6)
+        self.max_iterations = self.config.get('admission_control.max_iterations', 60)
+
+    def max_admissible_scaling(self, arrival_rates, priority_levels, allocations=None):
+        """
+        Compute the largest factors by which arrival rates can be scaled while
+        every node keeps rho_i = lambda_i / (alpha * R_i) <= max_utilization
+        and, if a delay budget is configured, the M/M/1 mean delay of the
+        scaled traffic stays within it.
+
+        Scales are computed for all nodes together (global), for each
+        priority class on its own, and for each node on its own. The
+        utilization bound is closed-form; the delay bound is found by
+        bisection over all groups at once, so allocations are solved at most
+        once.
+
+        The rho bound replaces StabilityAnalysis here: rho_i < 1 is the exact
+        stability condition of an M/M/1 queue, whereas the Lyapunov check
+        tests a random perturbation and is not monotone in the scale, so it
+        cannot be bisected.
+
+        Without a delay budget a class scale is never below global_scale.
+        With one, the budget applies to each group's own mean delay, so a
+        class made up of heavily loaded nodes can get a lower scale than
+        global_scale, where lightly loaded nodes of other classes pull the
+        mean delay down.
+
+        :param arrival_rates: List of arrival rates lambda_i for each node.
+        :param priority_levels: List of priority levels for each node.
+        :param allocations: Resource allocations R_i (optional, solved if omitted).
+        :return: Dict with global, per-class and per-node scales.
+        """
+        arrival_rates = np.asarray(arrival_rates, dtype=np.float64)
+        priority_levels = np.asarray(priority_levels)
+        if allocations is None:
+            allocations = self.resource_allocator.allocate_resources(arrival_rates, priority_levels)
+        service_rates = self.resource_allocator.alpha * np.asarray(allocations, dtype=np.float64)
+
+        with np.errstate(divide='ignore'):
+            node_scales = np.where(arrival_rates > 0, self.max_utilization * service_rates / arrival_rates, np.inf)
+
+        classes, class_index = np.unique(priority_levels, return_inverse=True)
+        global_scale = self._group_scales(arrival_rates, service_rates, node_scales, np.zeros(len(arrival_rates), dtype=np.intp), 1)[0]
+        class_scales = self._group_scales(arrival_rates, service_rates, node_scales, class_index, len(classes))
+
+        # Upper bound if resources were re-optimized for the scaled traffic
+        total_arrivals = np.sum(arrival_rates)
+        capacity = self.max_utilization * self.resource_allocator.alpha * self.resource_allocator.total_resources
+        capacity_scale = capacity / total_arrivals if total_arrivals > 0 else np.inf
+
+        result = {
+            "global_scale": float(global_scale),
+            "class_scales": {level.item(): float(scale) for level, scale in zip(classes, class_scales)},
+            "node_scales": node_scales,
+            "bottleneck_node": int(np.argmin(node_scales)),
+            "capacity_scale": float(capacity_scale),
+            "admissible_arrival_rates": arrival_rates * global_scale
+        }
+        self.logger.info(f"Admissible scaling: global {result['global_scale']}, per class {result['class_scales']}")
+        return result
+
+    def _group_scales(self, arrival_rates, service_rates, node_scales, groups, num_groups):
+        hi = np.full(num_groups, np.inf)
+        np.minimum.at(hi, groups, node_scales)
+        if self.delay_budget is None:
+            return hi
+
+        # The utilization bound keeps every queue finite, so bisect below it
+        feasible = self._delay_feasible(arrival_rates, service_rates, hi, groups, num_groups)
+        lo = np.where(feasible, hi, 0.0)
+        active = ~feasible & np.isfinite(hi)
+
+        # Groups without traffic stay at lo = hi = inf and are never active
+        with np.errstate(invalid='ignore'):
+            for _ in range(self.max_iterations):
+                if not np.any(active):
+                    break
+                mid = 0.5 * (lo + hi)
+                ok = self._delay_feasible(arrival_rates, service_rates, mid, groups, num_groups)
+                lo = np.where(active & ok, mid, lo)
+                hi = np.where(active & ~ok, mid, hi)
+                active &= (hi - lo) > self.tolerance * np.maximum(hi, 1.0)
+        return lo
+
+    def _delay_feasible(self, arrival_rates, service_rates, scales, groups, num_groups):
+        # Zero-arrival nodes in an unbounded group give 0 * inf; such groups carry no traffic
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scaled = arrival_rates * scales[groups]
+            rho = scaled / service_rates
+            in_system = rho / (1.0 - rho)
+            throughput = np.bincount(groups, weights=scaled, minlength=num_groups)
+            mean_delay = np.bincount(groups, weights=in_system, minlength=num_groups) / throughput
+        return np.nan_to_num(mean_delay, nan=0.0) <= self.delay_budget
+
+# Example usage
+if __name__ == "__main__":
+    # Example configuration
+    config_data = {
+        "resource_allocation": {
+            "total_resources": 1000,
+            "alpha": 0.1,
+            "beta": 0.1,
+            "gamma": 0.1,
+            "epsilon": 1e-5,
+            "max_iterations": 100
+        },
+        "admission_control": {
+            "max_utilization": 0.99,
+            "delay_budget": 0.5
+        },
+        "logging": {
+            "log_file": "logs/admission_control.log",
+            "log_level": "DEBUG"
+        }
+    }
+
+    # Initialize Admission Control with configuration
+    config = Config()
+    config.update_config(config_data)
+    admission_control = AdmissionControl(config=config)
+
+    # Example arrival rates, priority levels and allocations
+    arrival_rates = np.array([10, 20, 30, 40])
+    priority_levels = np.array([1, 2, 3, 4])
+    allocations = np.array([100, 200, 300, 400])
+
+    # Compute admissible scaling
+    scaling = admission_control.max_admissible_scaling(arrival_rates, priority_levels, allocations)
+    print(f"Global scale: {scaling['global_scale']}")
+    print(f"Per-class scales: {scaling['class_scales']}")
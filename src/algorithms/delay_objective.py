@@ -0,0 +1,116 @@
+import numpy as np
+
+def delay_objective(R, arrival_rates, priority_levels, alpha, beta, gamma, total_resources):
+    """
+    Delay plus utilization objective minimized by resource allocation.
+
+    f(R) = sum_i lambda_i * (1 / (alpha * R_i) + beta * P_i) + sum_i gamma * (T - R_i)
+
+    :param R: Resource allocations R_i for each node.
+    :param arrival_rates: Arrival rates lambda_i for each node.
+    :param priority_levels: Priority levels P_i for each node.
+    :param alpha: Resource-to-service-rate factor.
+    :param beta: Priority delay weight.
+    :param gamma: Utilization weight.
+    :param total_resources: Total resources T.
+    :return: Objective value.
+    """
+    R = np.asarray(R, dtype=np.float64)
+    delay = np.sum(arrival_rates * (1.0 / (alpha * R) + beta * np.asarray(priority_levels)))
+    utilization = gamma * np.sum(total_resources - R)
+    return delay + utilization
+
+def delay_gradient(R, arrival_rates, priority_levels, alpha, beta, gamma, total_resources):
+    """
+    Gradient of delay_objective with respect to R.
+
+    :return: Array of partial derivatives -lambda_i / (alpha * R_i^2) - gamma.
+    """
+    R = np.asarray(R, dtype=np.float64)
+    return -np.asarray(arrival_rates) / (alpha * R ** 2) - gamma
+
+def delay_hessian_diagonal(R, arrival_rates, priority_levels, alpha, beta, gamma, total_resources):
+    """
+    Diagonal of the Hessian of delay_objective; all off-diagonal terms are zero.
+
+    :return: Array of second derivatives 2 * lambda_i / (alpha * R_i^3).
+    """
+    R = np.asarray(R, dtype=np.float64)
+    return 2.0 * np.asarray(arrival_rates) / (alpha * R ** 3)
+
+def delay_hessian(R, arrival_rates, priority_levels, alpha, beta, gamma, total_resources):
+    """
+    Hessian of delay_objective as a dense matrix, for solvers that require one.
+
+    :return: Diagonal matrix of second derivatives.
+    """
+    return np.diag(delay_hessian_diagonal(R, arrival_rates, priority_levels, alpha, beta, gamma, total_resources))
+
+def delay_sensitivity(allocations, priority_levels, alpha, beta):
+    """
+    Marginal change in total delay per unit increase of each node's arrival rate,
+    with allocations held fixed.
+
+    :param allocations: Resource allocations R_i for each node.
+    :param priority_levels: Priority levels P_i for each node.
+    :param alpha: Resource-to-service-rate factor.
+    :param beta: Priority delay weight.
+    :return: Array of d(delay) / d(lambda_i).
+    """
+    return 1.0 / (alpha * np.asarray(allocations, dtype=np.float64)) + beta * np.asarray(priority_levels)
+
+def what_if_delay_change(arrival_rates, priority_levels, allocations, nodes, increases, alpha, beta, total_resources, reallocate=False):
+    """
+    Change in total delay if node nodes[k]'s arrival rate rises by increases[k],
+    answered for every query k in one vectorized pass.
+
+    With reallocate=False the allocations are held fixed and the answer is
+    exact, since the objective is linear in each lambda_i. With
+    reallocate=True resources are assumed re-optimized for the new rates.
+    Without active bounds the optimum gives R_i proportional to
+    sqrt(lambda_i), so the minimal delay term is
+    (sum_j sqrt(lambda_j))^2 / (alpha * T). That closed form only holds
+    while every rho_i bound (R_i >= lambda_i / alpha) is slack, before and
+    after the change. Queries whose new rates cannot be served at all
+    (sum_j lambda_j / alpha > T) return inf. Queries where a bound is
+    active return nan; re-solve those with allocate_resources.
+
+    :param arrival_rates: Arrival rates lambda_i for each node.
+    :param priority_levels: Priority levels P_i for each node.
+    :param allocations: Current resource allocations R_i for each node.
+    :param nodes: Node index of each query.
+    :param increases: Arrival rate increase of each query.
+    :param alpha: Resource-to-service-rate factor.
+    :param beta: Priority delay weight.
+    :param total_resources: Total resources T.
+    :param reallocate: Re-optimize allocations for the new rates.
+    :return: Array of delay changes, one per query.
+    """
+    arrival_rates = np.asarray(arrival_rates, dtype=np.float64)
+    priority_levels = np.asarray(priority_levels, dtype=np.float64)
+    nodes = np.asarray(nodes, dtype=np.intp)
+    increases = np.asarray(increases, dtype=np.float64)
+
+    if not reallocate:
+        return increases * delay_sensitivity(np.asarray(allocations)[nodes], priority_levels[nodes], alpha, beta)
+
+    roots = np.sqrt(arrival_rates)
+    total_root = np.sum(roots)
+    new_roots = np.sqrt(arrival_rates[nodes] + increases)
+    new_total_root = total_root - roots[nodes] + new_roots
+    queueing = (new_total_root ** 2 - total_root ** 2) / (alpha * total_resources)
+    change = queueing + beta * priority_levels[nodes] * increases
+
+    # sqrt-optimum R_i = T * sqrt(lambda_i) / S respects R_i >= lambda_i / alpha
+    # exactly when sqrt(lambda_i) <= alpha * T / S for every node
+    order = np.argsort(roots)
+    largest = roots[order[-1]]
+    second = roots[order[-2]] if len(roots) > 1 else 0.0
+    largest_other = np.where(nodes == order[-1], second, largest)
+    bound_active = ((largest > alpha * total_resources / total_root)
+                    | (np.maximum(largest_other, new_roots) > alpha * total_resources / new_total_root))
+    infeasible = (np.sum(arrival_rates) + increases) / alpha > total_resources
+
+    change[bound_active] = np.nan
+    change[infeasible] = np.inf
+    return change
@@ -6,11 +6,23 @@ sys.path.insert(0, parent_dir)
 import numpy as np
 from scipy.optimize import minimize
 from utils.logger import setup_logger
+from algorithms.result_cache import ResultCache
+from algorithms.delay_objective import delay_objective, delay_gradient, what_if_delay_change
 
 class ResourceAllocation:
-    def __init__(self, config):
+    def __init__(self, config, state_bus=None, metrics_store=None):
         self.config = config
+        self.state_bus = state_bus
+        self.metrics_store = metrics_store
         self.logger = setup_logger('ResourceAllocationLogger', self.config.get('logging.log_file', 'logs/resource_allocation.log'))
+        self.load_parameters()
+        self.cache = ResultCache(self.config, 'resource_allocation')
+
+    def load_parameters(self):
+        """
+        (Re)read the solver parameters from the configuration, so that config
+        updates take effect and invalidate cached results.
+        """
         self.total_resources = self.config.get('resource_allocation.total_resources', 1000)
         self.alpha = self.config.get('resource_allocation.alpha', 0.1)
         self.beta = self.config.get('resource_allocation.beta', 0.1)
@@ -18,31 +30,59 @@ class ResourceAllocation:
         self.epsilon = self.config.get('resource_allocation.epsilon', 1e-5)
         self.max_iterations = self.config.get('resource_allocation.max_iterations', 100)
 
-    def allocate_resources(self, arrival_rates, priority_levels, initial_allocations=None):
+    def cache_parameters(self):
+        """
+        Parameters that affect allocation results, used to key and invalidate the result cache.
+
+        :return: Dict of parameter values.
+        """
+        return {
+            "total_resources": self.total_resources,
+            "alpha": self.alpha,
+            "beta": self.beta,
+            "gamma": self.gamma,
+            "max_iterations": self.max_iterations
+        }
+
+    def allocate_resources(self, arrival_rates, priority_levels, initial_allocations=None, total_resources=None):
         """
         Allocate resources dynamically based on arrival rates and priority levels.
 
         :param arrival_rates: List of arrival rates ?i for each node.
         :param priority_levels: List of priority levels Pij for each node.
         :param initial_allocations: Initial resource allocations (optional).
+        :param total_resources: Resource budget to split among these nodes (optional, defaults to total_resources).
         :return: Optimal resource allocations for each node.
         """
+        self.load_parameters()
+        if total_resources is None:
+            total_resources = self.total_resources
+
+        cache_key, cached = self.cache.lookup((arrival_rates, priority_levels, initial_allocations), self.cache_parameters(),
+                                              key_params={"budget": total_resources})
+        if cached is not None:
+            self.logger.debug("Using cached resource allocations")
+            self._record_allocation(arrival_rates, cached)
+            return cached.copy()
+
+        arrival_rates = np.asarray(arrival_rates, dtype=np.float64)
+        priority_levels = np.asarray(priority_levels, dtype=np.float64)
         num_nodes = len(arrival_rates)
         if initial_allocations is None:
-            initial_allocations = np.full(num_nodes, self.total_resources / num_nodes)
+            initial_allocations = np.full(num_nodes, total_resources / num_nodes)
 
-        def objective(R):
-            delay = sum(arrival_rates[i] * (1 / (self.alpha * R[i]) + self.beta * priority_levels[i]) for i in range(num_nodes))
-            utilization = sum(self.gamma * (self.total_resources - R[i]) for i in range(num_nodes))
-            return delay + utilization
+        objective_args = (arrival_rates, priority_levels, self.alpha, self.beta, self.gamma, total_resources)
 
         constraints = [
-            {'type': 'eq', 'fun': lambda R: np.sum(R) - self.total_resources},
-            {'type': 'ineq', 'fun': lambda R: R - np.zeros(num_nodes)},  # R >= 0
-            {'type': 'ineq', 'fun': lambda R: np.ones(num_nodes) - (arrival_rates / (self.alpha * R))}  # ?i < 1
+            {'type': 'eq', 'fun': lambda R: np.sum(R) - total_resources,
+             'jac': lambda R: np.ones((1, num_nodes))}
         ]
+        # R >= 0 and rho_i = lambda_i / (alpha * R_i) <= 1 are both lower bounds on R_i,
+        # which avoids dense n x n constraint Jacobians
+        bounds = [(lower, None) for lower in np.maximum(arrival_rates / self.alpha, 0.0)]
 
-        result = minimize(objective, initial_allocations, constraints=constraints, options={'maxiter': self.max_iterations})
+        result = minimize(delay_objective, initial_allocations, args=objective_args, jac=delay_gradient,
+                          bounds=bounds, constraints=constraints, options={'maxiter': self.max_iterations})
 
         if not result.success:
             self.logger.error(f"Optimization failed: {result.message}")
@@ -50,8 +90,60 @@ class ResourceAllocation:
 
         optimal_allocations = result.x
         self.logger.info(f"Optimal resource allocations: {optimal_allocations}")
+        self.cache.store(cache_key, optimal_allocations.copy())
+        self._record_allocation(arrival_rates, optimal_allocations)
+        return optimal_allocations
+
+    def _record_allocation(self, arrival_rates, allocations):
+        if self.metrics_store is None:
+            return
+        arrival_rates = np.asarray(arrival_rates, dtype=np.float64)
+        try:
+            self.metrics_store.append_many({
+                "allocation.allocations": (np.arange(len(allocations)), allocations),
+                "allocation.traffic_intensities": (np.arange(len(allocations)), arrival_rates / (self.alpha * allocations))
+            })
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Error recording allocation metrics: {e}")
+
+    def allocate_from_state_bus(self, priority_levels):
+        """
+        Allocate resources for the arrival rates on the shared state bus and
+        publish the allocations and traffic intensities back to it.
+
+        :param priority_levels: List of priority levels Pij for each node.
+        :return: Optimal resource allocations for each node.
+        """
+        if self.state_bus is None:
+            raise ValueError("ResourceAllocation was created without a state_bus.")
+        # The solver outlives the read, so take the one copy it needs inside read_with
+        arrival_rates = self.state_bus.read_with(lambda arrival_rates: np.array(arrival_rates), 'arrival_rates')
+        optimal_allocations = self.allocate_resources(arrival_rates, priority_levels)
+        self.state_bus.write(
+            allocations=optimal_allocations,
+            traffic_intensities=arrival_rates / (self.alpha * optimal_allocations)
+        )
         return optimal_allocations
 
+    def delay_what_if(self, arrival_rates, priority_levels, allocations, nodes, increases, reallocate=False):
+        """
+        Estimate how total delay changes if arrival rates rise, for many nodes in one call.
+
+        With reallocate=True, queries that would make the rates infeasible
+        return inf, and queries where a rho_i bound is active return nan (see
+        what_if_delay_change).
+
+        :param arrival_rates: List of arrival rates lambda_i for each node.
+        :param priority_levels: List of priority levels P_i for each node.
+        :param allocations: Current resource allocations R_i for each node.
+        :param nodes: Node index of each query.
+        :param increases: Arrival rate increase of each query.
+        :param reallocate: Assume resources are re-optimized for the new rates.
+        :return: Array of total delay changes, one per query.
+        """
+        return what_if_delay_change(arrival_rates, priority_levels, allocations, nodes, increases,
+                                    self.alpha, self.beta, self.total_resources, reallocate=reallocate)
+
     def stability_analysis(self, arrival_rates, resource_allocations):
         """
         Perform stability analysis using Lyapunov's direct method.
@@ -0,0 +1,197 @@
+import sys
+import os
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+
+class ResultCache:
+    """
+    Bounded LRU cache for solver results.
+
+    Keys are a BLAKE2 hash of the input arrays, quantized to the configured
+    step, and of the solver parameters. Entries are evicted when the cache
+    exceeds max_entries or when they are older than max_age seconds. When
+    the parameters passed to lookup() differ from the previous call, the
+    in-memory tier is cleared. If disk_dir is set, results are also stored
+    as pickle files so a restarted process starts warm.
+    """
+
+    def __init__(self, config, name):
+        self.config = config
+        self.name = name
+        self.enabled = self.config.get('result_cache.enabled', True)
+        self.max_entries = self.config.get('result_cache.max_entries', 1024)
+        self.max_age = self.config.get('result_cache.max_age', 300)
+        self.quantum = self.config.get('result_cache.quantum', 1e-6)
+        self.max_disk_entries = self.config.get('result_cache.max_disk_entries', 10000)
+
+        disk_dir = self.config.get('result_cache.disk_dir')
+        self.disk_dir = os.path.join(disk_dir, name) if disk_dir else None
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+        self._entries = OrderedDict()
+        self._params = None
+        self._disk_writes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0
+        }
+
+    def make_key(self, arrays, params, key_params=None):
+        """
+        Hash quantized input arrays and solver parameters into a cache key.
+
+        :param arrays: Sequence of array-likes (None entries are allowed).
+        :param params: Dict of solver parameters.
+        :param key_params: Dict of per-call parameters (optional).
+        :return: Hex digest string.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for array in arrays:
+            if array is None:
+                digest.update(b'none')
+                continue
+            quantized = np.round(np.asarray(array, dtype=np.float64) / self.quantum).astype(np.int64)
+            digest.update(str(quantized.shape).encode())
+            digest.update(quantized.tobytes())
+        digest.update(repr(sorted(params.items())).encode())
+        if key_params:
+            digest.update(repr(sorted(key_params.items())).encode())
+        return digest.hexdigest()
+
+    def lookup(self, arrays, params, key_params=None):
+        """
+        Look up a cached result.
+
+        A change in params clears the cache. key_params are hashed into the
+        key only, for parameters that legitimately vary from call to call.
+
+        :param arrays: Sequence of input arrays.
+        :param params: Dict of solver parameters.
+        :param key_params: Dict of per-call parameters (optional).
+        :return: Tuple (key, value); value is None on a miss.
+        """
+        key = self.make_key(arrays, params, key_params)
+        if not self.enabled:
+            return key, None
+
+        now = time.time()
+        with self._lock:
+            if params != self._params:
+                if self._params is not None:
+                    self._entries.clear()
+                    self._stats['invalidations'] += 1
+                self._params = dict(params)
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if now - stored_at <= self.max_age:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return key, value
+                del self._entries[key]
+                self._stats['expirations'] += 1
+
+        entry = self._read_disk(key, now)
+        with self._lock:
+            if entry is not None:
+                self._stats['disk_hits'] += 1
+                self._insert(key, entry)
+                return key, entry[1]
+            self._stats['misses'] += 1
+        return key, None
+
+    def store(self, key, value):
+        """
+        Store a result under a key returned by lookup().
+
+        :param key: Cache key.
+        :param value: Result to cache.
+        """
+        if not self.enabled:
+            return
+        entry = (time.time(), value)
+        with self._lock:
+            self._insert(key, entry)
+        self._write_disk(key, entry)
+
+    def clear(self):
+        """
+        Drop all in-memory entries.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        """
+        Get hit/miss statistics.
+
+        :return: Statistics as a dictionary.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        lookups = stats['hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        return stats
+
+    def _insert(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def _read_disk(self, key, now):
+        if not self.disk_dir:
+            return None
+        path = os.path.join(self.disk_dir, f"{key}.pkl")
+        try:
+            with open(path, 'rb') as file:
+                entry = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        if now - entry[0] > self.max_age:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return entry
+
+    def _write_disk(self, key, entry):
+        if not self.disk_dir:
+            return
+        path = os.path.join(self.disk_dir, f"{key}.pkl")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as file:
+            pickle.dump(entry, file)
+        os.replace(tmp_path, path)
+
+        self._disk_writes += 1
+        if self._disk_writes % 100 == 0:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        paths = [os.path.join(self.disk_dir, f) for f in os.listdir(self.disk_dir) if f.endswith('.pkl')]
+        if len(paths) <= self.max_disk_entries:
+            return
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:len(paths) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -5,11 +5,19 @@ sys.path.insert(0, parent_dir)
 
 import numpy as np
 from utils.logger import setup_logger
+from algorithms.result_cache import ResultCache
 
 class StabilityAnalysis:
     def __init__(self, config):
         self.config = config
         self.logger = setup_logger('StabilityAnalysisLogger', self.config.get('logging.log_file', 'logs/stability_analysis.log'))
+        self.load_parameters()
+        self.cache = ResultCache(self.config, 'stability_analysis')
+
+    def load_parameters(self):
+        """
+        (Re)read the analysis parameters from the configuration.
+        """
         self.epsilon = self.config.get('stability_analysis.epsilon', 1e-5)
         self.alpha = self.config.get('stability_analysis.alpha', 0.1)
 
@@ -64,10 +72,17 @@ class StabilityAnalysis:
         :param allocation_strategy: A strategy dict defining resource allocation rules.
         :return: Boolean indicating overall system stability.
         """
+        self.load_parameters()
         arrival_rates = np.array(allocation_strategy['arrival_rates'])
-        service_rates = self.alpha * np.array(allocation_strategy['allocations'])
+        allocations = np.array(allocation_strategy['allocations'])
+
+        cache_key, cached = self.cache.lookup((arrival_rates, allocations), {"alpha": self.alpha, "epsilon": self.epsilon})
+        if cached is not None:
+            return cached
 
-        return self.stability_analysis(arrival_rates, service_rates)
+        is_stable = self.stability_analysis(arrival_rates, self.alpha * allocations)
+        self.cache.store(cache_key, is_stable)
+        return is_stable
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,236 @@
+import sys
+import os
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+import time
+from collections import deque
+import numpy as np
+from utils.logger import setup_logger
+from config.config import Config
+from controllers.sdn_controller import SDNController
+
+class CongestionRerouter:
+    """
+    Incremental reaction to congestion reports.
+
+    Installed flows are tracked together with their paths, and a reverse
+    index maps every directed link to the flows that traverse it. When
+    links are reported congested, only the flows crossing them are
+    re-placed on paths that avoid the congested links. Only flow entries
+    that actually changed are pushed. If a resource allocator and a
+    network manager are given, the rerouted flows also get their combined
+    resources re-split, and the new allocations are applied through the
+    network manager as part of the same reaction.
+    """
+
+    def __init__(self, sdn_controller, config, resource_allocator=None, network_manager=None):
+        self.sdn_controller = sdn_controller
+        self.config = config
+        self.resource_allocator = resource_allocator
+        self.network_manager = network_manager
+        self.logger = setup_logger('CongestionRerouterLogger', self.config.get('logging.log_file', 'logs/sdn_controller.log'))
+        self.utilization_threshold = self.config.get('congestion.utilization_threshold', 0.8)
+
+        self.flows = {}
+        self.link_flows = {}
+        self.latencies = deque(maxlen=self.config.get('congestion.latency_window', 1000))
+
+    def install_flows(self, flows):
+        """
+        Route and install flows, and start tracking them for rerouting.
+
+        :param flows: List of dicts with 'name', 'source' and 'destination', and
+                      optionally ports, 'arrival_rate', 'priority_level' and 'allocation'.
+        :return: List of flow entries pushed.
+        """
+        if self.sdn_controller.topology_index is None and self.sdn_controller.build_topology_index() is None:
+            self.logger.error("No topology available for path computation.")
+            return []
+
+        flows = [dict(flow, name=flow.get('name', f"{flow['source']}-{flow['destination']}")) for flow in flows]
+        paths = self.sdn_controller.topology_index.shortest_paths((flow['source'], flow['destination']) for flow in flows)
+        pushed = []
+        for flow, path in zip(flows, paths):
+            entries = self.sdn_controller.generate_path_flow_entries(flow, path)
+            if entries is None:
+                continue
+            self._track(flow, path, entries)
+            pushed.extend(entries)
+
+        self.sdn_controller.manage_flow_table(pushed)
+        return pushed
+
+    def remove_flow(self, name):
+        """
+        Stop tracking a flow.
+
+        :param name: Flow name.
+        """
+        record = self.flows.pop(name, None)
+        if record is None:
+            return
+        for link in zip(record['path'], record['path'][1:]):
+            self.link_flows.get(link, set()).discard(name)
+
+    def congested_links(self, congestion_metrics):
+        """
+        Extract congested links from congestion metrics.
+
+        :param congestion_metrics: Dict with a 'links' list of
+                                   {'source', 'destination', 'utilization'} dicts.
+        :return: Set of (source, destination) DPID tuples.
+        """
+        links = set()
+        for link in congestion_metrics.get('links', []):
+            if link.get('utilization', 0) >= self.utilization_threshold:
+                links.add((link['source'], link['destination']))
+        return links
+
+    def on_congestion(self, congestion_metrics, sample_time=None):
+        """
+        Reroute only the flows that traverse congested links.
+
+        :param congestion_metrics: Congestion metrics as returned by NetworkMonitor.monitor_congestion.
+        :param sample_time: Wall-clock time of the congestion sample (defaults to
+                            the metrics' 'timestamp', or now).
+        :return: Dict summarizing the reaction.
+        """
+        if sample_time is None:
+            sample_time = congestion_metrics.get('timestamp', time.time())
+
+        congested = self.congested_links(congestion_metrics)
+        affected = set()
+        for link in congested:
+            affected |= self.link_flows.get(link, set())
+
+        summary = {"congested_links": sorted(congested), "affected_flows": sorted(affected), "rerouted": [],
+                   "flow_mods": 0, "reallocated": [], "latency": None}
+        if not affected:
+            return summary
+
+        index = self.sdn_controller.topology_index
+        records = [self.flows[name] for name in sorted(affected)]
+        new_placements = []
+        for record in records:
+            flow = record['flow']
+            path = index.shortest_path_avoiding(flow['source'], flow['destination'], congested)
+            if path is None or path == record['path']:
+                continue
+            entries = self.sdn_controller.generate_path_flow_entries(flow, path)
+            if entries is not None:
+                new_placements.append((record, path, entries))
+
+        flow_mods = []
+        for record, path, entries in new_placements:
+            flow_mods.extend(self._diff_entries(record['entries'], entries))
+            self.remove_flow(record['flow']['name'])
+            self._track(record['flow'], path, entries)
+            summary['rerouted'].append(record['flow']['name'])
+
+        if flow_mods:
+            self.sdn_controller.manage_flow_table(flow_mods)
+        summary['reallocated'] = self._reallocate([record for record, _, _ in new_placements])
+        latency = time.time() - sample_time
+        self.latencies.append(latency)
+
+        summary['flow_mods'] = len(flow_mods)
+        summary['latency'] = latency
+        self.logger.info(f"Rerouted {len(summary['rerouted'])} of {len(affected)} affected flows "
+                         f"with {len(flow_mods)} flow modifications in {latency:.4f}s")
+        return summary
+
+    def react(self, network_monitor):
+        """
+        Fetch congestion metrics from a NetworkMonitor and react to them.
+
+        :param network_monitor: NetworkMonitor instance.
+        :return: Dict summarizing the reaction.
+        """
+        sample_time = time.time()
+        return self.on_congestion(network_monitor.monitor_congestion(), sample_time=sample_time)
+
+    def get_latency_stats(self):
+        """
+        Get reaction latency statistics, from congestion sample to installed flows.
+
+        :return: Dict with count, p50, p95 and max latency in seconds.
+        """
+        if not self.latencies:
+            return {"count": 0, "p50": None, "p95": None, "max": None}
+        latencies = np.asarray(self.latencies)
+        return {
+            "count": len(latencies),
+            "p50": float(np.percentile(latencies, 50)),
+            "p95": float(np.percentile(latencies, 95)),
+            "max": float(latencies.max())
+        }
+
+    def _track(self, flow, path, entries):
+        name = flow['name']
+        self.flows[name] = {"flow": flow, "path": path, "entries": entries}
+        for link in zip(path, path[1:]):
+            self.link_flows.setdefault(link, set()).add(name)
+
+    def _reallocate(self, records):
+        if self.resource_allocator is None or self.network_manager is None:
+            return []
+        flows = [record['flow'] for record in records]
+        if len(flows) < 2 or any('arrival_rate' not in f or 'allocation' not in f for f in flows):
+            return []
+
+        try:
+            allocations = self.resource_allocator.allocate_resources(
+                arrival_rates=[f['arrival_rate'] for f in flows],
+                priority_levels=[f.get('priority_level', 1) for f in flows],
+                total_resources=sum(f['allocation'] for f in flows)
+            )
+            # Same schema as node allocations, with the flow name as the resource id
+            self.network_manager.allocate_resources({
+                "resources": [{"id": f['name'], "allocated": float(allocation)} for f, allocation in zip(flows, allocations)]
+            })
+        except ValueError as e:
+            self.logger.error(f"Error reallocating resources for rerouted flows: {e}")
+            return []
+
+        for flow, allocation in zip(flows, allocations):
+            flow['allocation'] = float(allocation)
+        return [flow['name'] for flow in flows]
+
+    @staticmethod
+    def _diff_entries(old_entries, new_entries):
+        # Entry names repeat across switches (one per hop), so match on both
+        old_by_key = {(entry['switch'], entry['name']): entry for entry in old_entries}
+        new_keys = set()
+        mods = []
+        for entry in new_entries:
+            key = (entry['switch'], entry['name'])
+            new_keys.add(key)
+            if old_by_key.get(key) != entry:
+                mods.append(entry)
+        for key, entry in old_by_key.items():
+            if key not in new_keys:
+                mods.append(dict(entry, active="false"))
+        return mods
+
+# Example usage
+if __name__ == "__main__":
+    # Load configuration
+    config = Config(config_file='config/config.json')
+
+    # Initialize SDN Controller and the rerouter
+    sdn_controller = SDNController(config=config)
+    rerouter = CongestionRerouter(sdn_controller, config)
+
+    # Install tracked flows
+    rerouter.install_flows([
+        {"name": "flow_1", "source": "00:00:00:00:00:00:00:01", "destination": "00:00:00:00:00:00:00:03", "in_port": 1, "out_port": 1}
+    ])
+
+    # React to a congestion report
+    summary = rerouter.on_congestion({
+        "links": [
+            {"source": "00:00:00:00:00:00:00:01", "destination": "00:00:00:00:00:00:00:02", "utilization": 0.95}
+        ]
+    })
+    print(f"Congestion reaction: {summary}")
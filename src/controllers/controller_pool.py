@@ -0,0 +1,128 @@
+import sys
+import os
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from utils.hash_ring import HashRing
+
+def controller_base_urls(config):
+    """
+    Get the base URLs of all configured controller instances.
+
+    Uses 'network.controllers' (a list of {protocol, host, port} dicts or
+    URL strings) when present, and falls back to the single controller at
+    'network.protocol'/'network.host'/'network.port'.
+
+    :param config: Configuration object.
+    :return: List of base URLs.
+    """
+    controllers = config.get('network.controllers') or [{}]
+    urls = []
+    for controller in controllers:
+        if isinstance(controller, str):
+            urls.append(controller.rstrip('/'))
+            continue
+        protocol = controller.get('protocol', config.get('network.protocol'))
+        host = controller.get('host', config.get('network.host'))
+        port = controller.get('port', config.get('network.port'))
+        urls.append(f"{protocol}://{host}:{port}")
+    return urls
+
+class ControllerPool:
+    """
+    Shard switches across controller instances by consistent hashing on DPID.
+    """
+
+    def __init__(self, config, logger):
+        self.config = config
+        self.logger = logger
+        self.ring = HashRing(controller_base_urls(config), replicas=self.config.get('network.ring_replicas', 100))
+        self.assignments = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.config.get('network.max_parallel_requests', 16))
+
+    @property
+    def base_urls(self):
+        return list(self.ring.nodes)
+
+    def owner(self, dpid):
+        """
+        Get the base URL of the controller owning a switch.
+
+        :param dpid: Switch DPID.
+        :return: Controller base URL.
+        """
+        with self._lock:
+            url = self.assignments.get(dpid)
+            if url is None:
+                url = self.ring.get_node(dpid)
+                self.assignments[dpid] = url
+            return url
+
+    def partition(self, items, key):
+        """
+        Group items by the controller owning their switch.
+
+        :param items: Iterable of items.
+        :param key: Function returning the switch DPID of an item.
+        :return: Dict mapping controller base URL to a list of items.
+        """
+        shards = {}
+        for item in items:
+            shards.setdefault(self.owner(key(item)), []).append(item)
+        return shards
+
+    def run_parallel(self, shards, func):
+        """
+        Call func(base_url, items) for every shard in parallel.
+
+        :param shards: Dict mapping controller base URL to a list of items.
+        :param func: Function to call per shard.
+        :return: Dict mapping controller base URL to the exception raised, if any.
+        """
+        futures = {url: self._executor.submit(func, url, items) for url, items in shards.items()}
+        errors = {}
+        for url, future in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                errors[url] = e
+        return errors
+
+    def add_controller(self, base_url):
+        """
+        Add a controller instance and rebalance switch assignments.
+
+        :param base_url: Controller base URL.
+        :return: Dict of moved switches, DPID -> (old URL, new URL).
+        """
+        with self._lock:
+            self.ring.add_node(base_url.rstrip('/'))
+            return self._rebalance()
+
+    def remove_controller(self, base_url):
+        """
+        Remove a controller instance and rebalance switch assignments.
+
+        :param base_url: Controller base URL.
+        :return: Dict of moved switches, DPID -> (old URL, new URL).
+        :raises ValueError: If base_url is the last controller, which would leave switches unowned.
+        """
+        base_url = base_url.rstrip('/')
+        with self._lock:
+            if self.ring.nodes == [base_url]:
+                raise ValueError(f"Cannot remove the last controller {base_url}.")
+            self.ring.remove_node(base_url)
+            return self._rebalance()
+
+    def _rebalance(self):
+        moved = {}
+        for dpid, old_url in self.assignments.items():
+            new_url = self.ring.get_node(dpid)
+            if new_url != old_url:
+                moved[dpid] = (old_url, new_url)
+                self.assignments[dpid] = new_url
+        self.logger.info(f"Rebalanced controllers {self.ring.nodes}: {len(moved)} of {len(self.assignments)} switches moved")
+        return moved
@@ -7,10 +7,14 @@ import requests
 import json
 from utils.logger import setup_logger
 from config.config import Config
+from utils.resilience import ControllerClient
+from network.topology_index import TopologyIndex
+from controllers.controller_pool import ControllerPool
 
 class SDNController:
-    def __init__(self, config):
+    def __init__(self, config, state_bus=None):
         self.config = config
+        self.state_bus = state_bus
         self.logger = setup_logger('SDNControllerLogger', self.config.get('logging.log_file', 'logs/sdn_controller.log'))
 
         # Retrieve network settings
@@ -27,23 +31,56 @@ class SDNController:
         # Debugging: Print constructed base URL
         self.logger.debug(f"Base URL: {self.base_url}")
 
+        # Client enforcing timeouts and circuit breaking for controller calls
+        self.client = ControllerClient(self.config, self.logger)
+
+        # Controller shards that own flow tables, keyed by switch DPID
+        self.controllers = ControllerPool(self.config, self.logger)
+
+        # Topology index used for automatic path computation
+        self.topology_index = None
+
     def manage_flow_table(self, flow_entries):
         """
         Manage the flow table by adding new flow entries.
 
+        Entries are sent to the controller owning their switch, with all
+        controllers being updated in parallel.
+
         :param flow_entries: List of flow entries to be added to the flow table.
         """
-        url = f"{self.base_url}/flowtable"
+        shards = self.controllers.partition(flow_entries, key=lambda entry: entry.get('switch'))
+        self.controllers.run_parallel(shards, self._push_flow_entries)
+
+    def _push_flow_entries(self, base_url, flow_entries):
+        url = f"{base_url}/flowtable"
         headers = {'Content-Type': 'application/json'}
 
         for entry in flow_entries:
             try:
-                response = requests.post(url, headers=headers, data=json.dumps(entry))
-                response.raise_for_status()
+                self.client.post(url, headers=headers, data=json.dumps(entry))
                 self.logger.info(f"Successfully added flow entry: {entry}")
             except requests.exceptions.RequestException as e:
                 self.logger.error(f"Error adding flow entry: {entry}, Error: {e}")
 
+    def add_controller(self, base_url):
+        """
+        Add a controller instance and rebalance switch ownership.
+
+        :param base_url: Controller base URL.
+        :return: Dict of moved switches, DPID -> (old URL, new URL).
+        """
+        return self.controllers.add_controller(base_url)
+
+    def remove_controller(self, base_url):
+        """
+        Remove a controller instance and rebalance switch ownership.
+
+        :param base_url: Controller base URL.
+        :return: Dict of moved switches, DPID -> (old URL, new URL).
+        """
+        return self.controllers.remove_controller(base_url)
+
     def centralized_control(self):
         """
         Example method to demonstrate centralized control.
@@ -74,13 +111,39 @@ class SDNController:
         """
         url = f"{self.base_url}/topology"
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            return response.json()
+            return self.client.get_json(url)
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Error fetching topology: {e}")
             return None
 
+    def build_topology_index(self):
+        """
+        Fetch the current topology and build a path computation index from it.
+
+        :return: TopologyIndex, or None if the topology could not be fetched.
+        """
+        topology = self.get_topology()
+        if topology is None:
+            return None
+        self.topology_index = TopologyIndex(topology)
+        self.logger.info(f"Built topology index with {self.topology_index.num_nodes} switches and {self.topology_index.num_links} links")
+        return self.topology_index
+
+    def read_allocation_state(self, func, *fields):
+        """
+        Apply func to a consistent, zero-copy view of the allocation state on the shared state bus.
+
+        func receives read-only arrays as keyword arguments, may run more than
+        once and must not keep them; see SharedStateBus.read_with.
+
+        :param func: Function taking 'arrival_rates', 'allocations' and/or 'traffic_intensities'.
+        :param fields: Field names to pass (all fields if omitted).
+        :return: func's result, with 'versions' merged in if it is a dict.
+        """
+        if self.state_bus is None:
+            raise ValueError("SDNController was created without a state_bus.")
+        return self.state_bus.read_with(func, *fields)
+
     def dynamic_resource_allocation(self, allocation_strategy):
         """
         Perform dynamic resource allocation based on a given strategy.
@@ -112,8 +175,66 @@ class SDNController:
                 "actions": rule.get("actions")
             }
             flow_entries.append(entry)
+        flow_entries.extend(self.generate_flow_entries_for_flows(strategy.get('flows', [])))
+        return flow_entries
+
+    def generate_flow_entries_for_flows(self, flows):
+        """
+        Generate hop-by-hop flow entries for source/destination switch pairs.
+
+        Paths are computed in one batch over the topology index. Each flow may
+        set 'in_port' (ingress port on the source switch) and 'out_port'
+        (egress port on the destination switch).
+
+        :param flows: List of dicts with 'source' and 'destination' DPIDs.
+        :return: List of flow entries.
+        """
+        if not flows:
+            return []
+        if self.topology_index is None and self.build_topology_index() is None:
+            self.logger.error("No topology available for path computation.")
+            return []
+
+        paths = self.topology_index.shortest_paths((flow['source'], flow['destination']) for flow in flows)
+
+        flow_entries = []
+        for flow, path in zip(flows, paths):
+            entries = self.generate_path_flow_entries(flow, path)
+            if entries is not None:
+                flow_entries.extend(entries)
         return flow_entries
 
+    def generate_path_flow_entries(self, flow, path):
+        """
+        Generate hop-by-hop flow entries for one flow along a given path.
+
+        :param flow: Dict with 'source' and 'destination' DPIDs and optional ports.
+        :param path: List of switch DPIDs from source to destination.
+        :return: List of flow entries, or None if the path is unusable.
+        """
+        name = flow.get('name', f"{flow['source']}-{flow['destination']}")
+        if path is None:
+            self.logger.error(f"No path for flow {name}")
+            return None
+
+        hops = list(zip(path, path[1:]))
+        ports = [self.topology_index.link_ports(u, v) for u, v in hops]
+        in_ports = [flow.get('in_port')] + [dst_port for _, dst_port in ports]
+        out_ports = [src_port for src_port, _ in ports] + [flow.get('out_port')]
+        if None in out_ports:
+            self.logger.error(f"Missing port information along path {path} for flow {name}")
+            return None
+
+        return [{
+            "switch": switch,
+            "name": f"{name}_{hop}",
+            "cookie": flow.get("cookie", "0"),
+            "priority": flow.get("priority", "32768"),
+            "in_port": None if in_ports[hop] is None else str(in_ports[hop]),
+            "active": flow.get("active", "true"),
+            "actions": f"output={out_ports[hop]}"
+        } for hop, switch in enumerate(path)]
+
 # Example usage
 if __name__ == "__main__":
     # Load configuration
@@ -142,6 +263,15 @@ if __name__ == "__main__":
                 "in_port": "3",
                 "actions": "output=2"
             }
+        ],
+        "flows": [
+            {
+                "source": "00:00:00:00:00:00:00:01",
+                "destination": "00:00:00:00:00:00:00:02",
+                "name": "routed_flow_1",
+                "in_port": "1",
+                "out_port": "1"
+            }
         ]
     }
 
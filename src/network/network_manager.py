@@ -7,6 +7,20 @@ import requests
 import json
 from utils.logger import setup_logger
 from config.config import Config
+from utils.resilience import ControllerClient
+from controllers.controller_pool import ControllerPool
+
+class NodeManagementError(ValueError):
+    """
+    Raised when some controller shards fail to apply a node batch.
+
+    failed_nodes lists only the nodes of the failed shards; the other
+    shards were applied and must not be resent.
+    """
+
+    def __init__(self, message, failed_nodes):
+        super().__init__(message)
+        self.failed_nodes = failed_nodes
 
 class NetworkManager:
     def __init__(self, config):
@@ -27,6 +41,12 @@ class NetworkManager:
         # Debugging: Print constructed base URL
         self.logger.debug(f"Base URL: {self.base_url}")
 
+        # Client enforcing timeouts and circuit breaking for controller calls
+        self.client = ControllerClient(self.config, self.logger)
+
+        # Controller shards that own node state, keyed by switch DPID
+        self.controllers = ControllerPool(self.config, self.logger)
+
     def configure_network(self, network_config):
         """
         Configure the network based on the provided configuration.
@@ -37,8 +57,7 @@ class NetworkManager:
         headers = {'Content-Type': 'application/json'}
         
         try:
-            response = requests.post(url, headers=headers, data=json.dumps(network_config))
-            response.raise_for_status()
+            self.client.post(url, headers=headers, data=json.dumps(network_config))
             self.logger.info(f"Successfully configured the network with config: {network_config}")
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Error configuring the network: {e}")
@@ -48,18 +67,45 @@ class NetworkManager:
         """
         Manage network nodes by adding, removing, or updating node configurations.
 
+        Nodes are sent to the controller owning their DPID, with all
+        controllers being updated in parallel.
+
         :param nodes: List of node configurations.
+        :raises NodeManagementError: If any shard failed, listing the nodes of the failed shards.
         """
-        url = f"{self.base_url}/network/nodes"
+        shards = self.controllers.partition(nodes, key=lambda node: node['id'])
+        errors = self.controllers.run_parallel(shards, self._put_nodes)
+
+        if errors:
+            for base_url, e in errors.items():
+                self.logger.error(f"Error managing network nodes on {base_url}: {e}")
+            failed_nodes = [node for base_url in errors for node in shards[base_url]]
+            raise NodeManagementError(f"Network node management failed on {len(errors)} of {len(shards)} controllers.",
+                                      failed_nodes)
+        self.logger.info(f"Successfully managed network nodes: {nodes}")
+
+    def _put_nodes(self, base_url, nodes):
+        url = f"{base_url}/network/nodes"
         headers = {'Content-Type': 'application/json'}
-        
-        try:
-            response = requests.put(url, headers=headers, data=json.dumps(nodes))
-            response.raise_for_status()
-            self.logger.info(f"Successfully managed network nodes: {nodes}")
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"Error managing network nodes: {e}")
-            raise ValueError("Network node management failed.")
+        self.client.put(url, headers=headers, data=json.dumps(nodes))
+
+    def add_controller(self, base_url):
+        """
+        Add a controller instance and rebalance node ownership.
+
+        :param base_url: Controller base URL.
+        :return: Dict of moved switches, DPID -> (old URL, new URL).
+        """
+        return self.controllers.add_controller(base_url)
+
+    def remove_controller(self, base_url):
+        """
+        Remove a controller instance and rebalance node ownership.
+
+        :param base_url: Controller base URL.
+        :return: Dict of moved switches, DPID -> (old URL, new URL).
+        """
+        return self.controllers.remove_controller(base_url)
 
     def allocate_resources(self, resource_allocation):
         """
@@ -71,8 +117,7 @@ class NetworkManager:
         headers = {'Content-Type': 'application/json'}
         
         try:
-            response = requests.post(url, headers=headers, data=json.dumps(resource_allocation))
-            response.raise_for_status()
+            self.client.post(url, headers=headers, data=json.dumps(resource_allocation))
             self.logger.info(f"Successfully allocated resources: {resource_allocation}")
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Error allocating resources: {e}")
@@ -87,9 +132,7 @@ class NetworkManager:
         url = f"{self.base_url}/network/status"
         
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            network_status = response.json()
+            network_status = self.client.get_json(url)
             self.logger.info(f"Current network status: {network_status}")
             return network_status
         except requests.exceptions.RequestException as e:
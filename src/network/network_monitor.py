@@ -7,12 +7,16 @@ import requests
 import json
 from utils.logger import setup_logger
 from config.config import Config
+from utils.resilience import ControllerClient
 
 class NetworkMonitor:
-    def __init__(self, config):
+    def __init__(self, config, state_bus=None, metrics_store=None):
         self.config = config
+        self.state_bus = state_bus
+        self.metrics_store = metrics_store
         self.logger = setup_logger('NetworkMonitorLogger', self.config.get('logging.log_file', 'logs/network_monitor.log'))
         self.base_url = f"{self.config.get('network.protocol')}://{self.config.get('network.host')}:{self.config.get('network.port')}"
+        self.client = ControllerClient(self.config, self.logger)
 
     def get_network_status(self):
         """
@@ -22,9 +26,7 @@ class NetworkMonitor:
         """
         url = f"{self.base_url}/network/status"
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            network_status = response.json()
+            network_status = self.client.get_json(url, fallback=True)
             self.logger.info(f"Network status: {json.dumps(network_status, indent=4)}")
             return network_status
         except requests.exceptions.RequestException as e:
@@ -39,10 +41,10 @@ class NetworkMonitor:
         """
         url = f"{self.base_url}/network/traffic"
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            traffic_stats = response.json()
+            traffic_stats = self.client.get_json(url, fallback=True)
             self.logger.info(f"Traffic statistics: {json.dumps(traffic_stats, indent=4)}")
+            self._publish_arrival_rates(traffic_stats)
+            self._record_metrics('traffic', url, traffic_stats)
             return traffic_stats
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Error fetching traffic statistics: {e}")
@@ -56,15 +58,42 @@ class NetworkMonitor:
         """
         url = f"{self.base_url}/network/congestion"
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            congestion_metrics = response.json()
+            congestion_metrics = self.client.get_json(url, fallback=True)
             self.logger.info(f"Congestion metrics: {json.dumps(congestion_metrics, indent=4)}")
+            self._record_metrics('congestion', url, congestion_metrics)
             return congestion_metrics
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Error fetching congestion metrics: {e}")
             raise ValueError("Failed to fetch congestion metrics.")
 
+    def _publish_arrival_rates(self, traffic_stats):
+        if self.state_bus is None or 'arrival_rates' not in traffic_stats:
+            return
+        arrival_rates = traffic_stats['arrival_rates']
+        if not isinstance(arrival_rates, (list, tuple)) or not all(
+                isinstance(rate, (int, float)) and not isinstance(rate, bool) for rate in arrival_rates):
+            self.logger.error(f"Not publishing arrival rates: expected a list of numbers, got {type(arrival_rates).__name__}")
+            return
+        try:
+            self.state_bus.write(arrival_rates=arrival_rates)
+        except (ValueError, TypeError) as e:
+            self.logger.error(f"Error publishing arrival rates to the state bus: {e}")
+
+    def _record_metrics(self, kind, url, sample):
+        if self.metrics_store is None:
+            return
+        if self.client.breaker_for(url).is_open:
+            # get_json served the last known good value, which is already stored
+            self.logger.debug(f"Not recording stale {kind} metrics while the circuit is open")
+            return
+        if not isinstance(sample, dict):
+            self.logger.error(f"Not recording {kind} metrics: expected an object, got {type(sample).__name__}")
+            return
+        try:
+            self.metrics_store.record_sample(kind, sample)
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Error recording {kind} metrics: {e}")
+
 # Example usage
 if __name__ == "__main__":
     # Example configuration
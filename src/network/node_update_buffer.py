@@ -0,0 +1,255 @@
+import sys
+import os
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+import threading
+import time
+from collections import OrderedDict
+from utils.logger import setup_logger
+from config.config import Config
+from network.network_manager import NetworkManager, NodeManagementError
+
+class NodeUpdateBuffer:
+    """
+    Coalescing buffer in front of NetworkManager.manage_nodes.
+
+    Node actions are merged per node ID while they wait to be sent:
+
+    - add followed by remove cancels out
+    - remove followed by add becomes an update with the new fields
+    - update/add followed by update merges the fields
+    - update followed by remove becomes a remove
+    - updates to a node pending removal are dropped
+
+    Pending actions are flushed by a background thread once max_batch_size
+    nodes are pending or the oldest pending action is max_delay seconds old.
+    While a flush is in progress new actions keep coalescing; once
+    max_pending distinct nodes are waiting, submit() blocks until the
+    controller catches up.
+    """
+
+    def __init__(self, network_manager, config):
+        self.network_manager = network_manager
+        self.config = config
+        self.logger = setup_logger('NodeUpdateBufferLogger', self.config.get('logging.log_file', 'logs/network_manager.log'))
+        self.max_batch_size = self.config.get('node_updates.max_batch_size', 100)
+        self.max_delay = self.config.get('node_updates.max_delay', 0.05)
+        self.max_pending = self.config.get('node_updates.max_pending', 1000)
+        self.block_timeout = self.config.get('node_updates.block_timeout', 5.0)
+        self.retry_delay = self.config.get('node_updates.retry_delay', 1.0)
+
+        self._pending = OrderedDict()
+        self._oldest = None
+        self._retry_at = 0.0
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._running = False
+
+        self._metrics = {
+            "submitted": 0,
+            "merged": 0,
+            "cancelled": 0,
+            "dropped": 0,
+            "sent": 0,
+            "requests": 0,
+            "failed_requests": 0,
+            "blocked": 0
+        }
+
+    def start(self):
+        """
+        Start the background flush thread.
+        """
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name='NodeUpdateBuffer', daemon=True)
+        self._thread.start()
+
+    def stop(self, flush=True):
+        """
+        Stop the background flush thread.
+
+        :param flush: Send any pending actions before returning.
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if flush:
+            self.flush()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def submit(self, node):
+        """
+        Queue a single node action.
+
+        :param node: Node configuration with 'id' and 'action' keys.
+        """
+        self.submit_many([node])
+
+    def submit_many(self, nodes):
+        """
+        Queue several node actions, blocking while the buffer is full.
+
+        :param nodes: List of node configurations.
+        """
+        with self._condition:
+            was_empty = not self._pending
+            for node in nodes:
+                if node['id'] not in self._pending and len(self._pending) >= self.max_pending:
+                    self._metrics['blocked'] += 1
+                    self._condition.notify_all()
+                    if not self._condition.wait_for(lambda: len(self._pending) < self.max_pending, timeout=self.block_timeout):
+                        self.logger.error(f"Node update buffer full ({len(self._pending)} pending nodes)")
+                        raise ValueError("Node update buffer is full.")
+
+                self._metrics['submitted'] += 1
+                self._merge(node)
+
+            # Wake the flush thread when a new max_delay deadline starts or a batch is full
+            if (was_empty and self._pending) or len(self._pending) >= self.max_batch_size:
+                self._condition.notify_all()
+
+    def flush(self):
+        """
+        Send all pending node actions to the controller.
+
+        The nodes of failed controller shards, and any batches not yet sent,
+        are merged back in front of newer pending actions and retried by the
+        background thread after retry_delay seconds. Shards that succeeded
+        are not resent.
+
+        :return: Number of node actions sent.
+        """
+        with self._flush_lock:
+            with self._condition:
+                batch = list(self._pending.values())
+                self._pending = OrderedDict()
+                self._oldest = None
+
+            sent = 0
+            for start in range(0, len(batch), self.max_batch_size):
+                chunk = batch[start:start + self.max_batch_size]
+                try:
+                    self.network_manager.manage_nodes(chunk)
+                except ValueError as e:
+                    failed = e.failed_nodes if isinstance(e, NodeManagementError) else chunk
+                    retry = failed + batch[start + self.max_batch_size:]
+                    self.logger.error(f"Error flushing {len(retry)} node updates, will retry: {e}")
+                    sent += len(chunk) - len(failed)
+                    with self._condition:
+                        self._metrics['failed_requests'] += 1
+                        self._metrics['sent'] += len(chunk) - len(failed)
+                        self._requeue(retry)
+                    break
+
+                sent += len(chunk)
+                with self._condition:
+                    self._metrics['requests'] += 1
+                    self._metrics['sent'] += len(chunk)
+
+            with self._condition:
+                self._condition.notify_all()
+            return sent
+
+    def get_metrics(self):
+        """
+        Get coalescing and flush statistics.
+
+        :return: Metrics as a dictionary.
+        """
+        with self._condition:
+            metrics = dict(self._metrics)
+            metrics['pending'] = len(self._pending)
+        metrics['coalescing_ratio'] = metrics['submitted'] / metrics['sent'] if metrics['sent'] else None
+        return metrics
+
+    def _merge(self, node, count=True):
+        node_id = node['id']
+        action = node.get('action', 'update')
+        fields = {k: v for k, v in node.items() if k not in ('id', 'action')}
+
+        current = self._pending.get(node_id)
+        if current is None:
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            self._pending[node_id] = {"id": node_id, "action": action, **fields}
+            return
+
+        if count:
+            self._metrics['merged'] += 1
+        previous = current['action']
+
+        if action == 'remove':
+            if previous == 'add':
+                del self._pending[node_id]
+                if not self._pending:
+                    self._oldest = None
+                if count:
+                    self._metrics['cancelled'] += 1
+            else:
+                self._pending[node_id] = {"id": node_id, "action": "remove"}
+        elif previous == 'remove':
+            if action == 'add':
+                self._pending[node_id] = {"id": node_id, "action": "update", **fields}
+            elif count:
+                self._metrics['dropped'] += 1
+        else:
+            current.update(fields)
+
+    def _requeue(self, failed):
+        newer = list(self._pending.values())
+        self._pending = OrderedDict()
+        for node in failed + newer:
+            self._merge(node, count=False)
+        self._oldest = time.monotonic() if self._pending else None
+        self._retry_at = time.monotonic() + self.retry_delay
+
+    def _next_flush(self):
+        if not self._pending:
+            return None
+        due = self._oldest + self.max_delay
+        if len(self._pending) >= min(self.max_batch_size, self.max_pending):
+            due = 0.0
+        return max(due, self._retry_at)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running:
+                    due = self._next_flush()
+                    if due is not None and due <= time.monotonic():
+                        break
+                    self._condition.wait(None if due is None else due - time.monotonic())
+                if not self._running:
+                    return
+            self.flush()
+
+# Example usage
+if __name__ == "__main__":
+    # Load configuration
+    config = Config(config_file='config/config.json')
+
+    # Initialize Network Manager and the coalescing buffer in front of it
+    network_manager = NetworkManager(config=config)
+
+    with NodeUpdateBuffer(network_manager, config) as buffer:
+        # A burst of joins and leaves
+        buffer.submit({"id": "00:00:00:00:00:00:00:01", "action": "add"})
+        buffer.submit({"id": "00:00:00:00:00:00:00:02", "action": "add"})
+        buffer.submit({"id": "00:00:00:00:00:00:00:01", "action": "update", "ports": 4})
+        buffer.submit({"id": "00:00:00:00:00:00:00:02", "action": "remove"})
+
+    print(f"Node update metrics: {buffer.get_metrics()}")
@@ -0,0 +1,409 @@
+import sys
+import os
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+import heapq
+from numbers import Number
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+class TopologyIndex:
+    """
+    Compact graph index over the controller topology.
+
+    Switch DPIDs are mapped to dense integer IDs and links are stored as
+    directed edges in CSR form (indptr, indices, weights). The weight of a
+    link is the inverse of its capacity, so shortest paths prefer wide links.
+    """
+
+    def __init__(self, topology=None):
+        self.node_ids = {}
+        self.node_names = []
+
+        # Edge storage, indexed by edge ID
+        self._edge_ids = {}
+        self._src = []
+        self._dst = []
+        self._capacity = []
+        self._src_port = []
+        self._dst_port = []
+        self._free_edges = []
+
+        # CSR arrays, rebuilt lazily when the edge set changes
+        self._indptr = None
+        self._indices = None
+        self._weights = None
+        self._csr_edges = None
+        self._csr_position = None
+        self._graph = None
+
+        # Shortest path trees keyed by source node ID
+        self._tree_cache = {}
+
+        if topology:
+            self.load(topology)
+
+    def load(self, topology):
+        """
+        Load switches and links from a topology response.
+
+        :param topology: Topology dict with 'switches' and 'links' lists.
+        """
+        for switch in topology.get('switches', []):
+            self.add_switch(switch['id'] if isinstance(switch, dict) else switch)
+
+        for link in topology.get('links', []):
+            self.add_link(
+                link.get('source', link.get('src-switch')),
+                link.get('destination', link.get('dst-switch')),
+                capacity=link.get('capacity', 1),
+                src_port=link.get('source_port', link.get('src-port')),
+                dst_port=link.get('destination_port', link.get('dst-port')),
+                bidirectional=link.get('bidirectional', True)
+            )
+
+    @property
+    def num_nodes(self):
+        return len(self.node_names)
+
+    @property
+    def num_links(self):
+        return len(self._edge_ids)
+
+    def add_switch(self, dpid):
+        """
+        Register a switch and return its integer node ID.
+
+        :param dpid: Switch DPID.
+        :return: Integer node ID.
+        """
+        node = self.node_ids.get(dpid)
+        if node is None:
+            node = len(self.node_names)
+            self.node_ids[dpid] = node
+            self.node_names.append(dpid)
+            self._invalidate()
+        return node
+
+    def add_link(self, source, destination, capacity=1, src_port=None, dst_port=None, bidirectional=True):
+        """
+        Add a link, or update it if it already exists.
+
+        :param source: Source switch DPID.
+        :param destination: Destination switch DPID.
+        :param capacity: Link capacity; the link weight is 1 / capacity.
+        :param src_port: Output port on the source switch (optional).
+        :param dst_port: Input port on the destination switch (optional).
+        :param bidirectional: Also add the reverse direction.
+        """
+        _check_capacity(capacity)
+        u = self.add_switch(source)
+        v = self.add_switch(destination)
+        self._set_edge(u, v, capacity, src_port, dst_port)
+        if bidirectional:
+            self._set_edge(v, u, capacity, dst_port, src_port)
+
+    def remove_link(self, source, destination, bidirectional=True):
+        """
+        Remove a link.
+
+        :param source: Source switch DPID.
+        :param destination: Destination switch DPID.
+        :param bidirectional: Also remove the reverse direction.
+        """
+        pairs = [(source, destination)]
+        if bidirectional:
+            pairs.append((destination, source))
+
+        for src, dst in pairs:
+            key = (self.node_ids.get(src), self.node_ids.get(dst))
+            edge = self._edge_ids.pop(key, None)
+            if edge is None:
+                continue
+            self._free_edges.append(edge)
+            self._drop_trees_using(*key)
+            self._indptr = None
+
+    def update_link_capacity(self, source, destination, capacity, bidirectional=True):
+        """
+        Change the capacity of an existing link in place.
+
+        :param source: Source switch DPID.
+        :param destination: Destination switch DPID.
+        :param capacity: New link capacity.
+        :param bidirectional: Also update the reverse direction.
+        """
+        pairs = [(source, destination)]
+        if bidirectional:
+            pairs.append((destination, source))
+
+        _check_capacity(capacity)
+        edges = []
+        for src, dst in pairs:
+            edge = self._edge_ids.get((self.node_ids.get(src), self.node_ids.get(dst)))
+            if edge is None:
+                raise ValueError(f"Unknown link: {src} -> {dst}")
+            edges.append(edge)
+
+        # Only change anything once every direction is known to exist
+        for edge in edges:
+            self._update_capacity(edge, capacity)
+
+    def link_ports(self, source, destination):
+        """
+        Get the (src_port, dst_port) pair of a directed link.
+
+        :param source: Source switch DPID.
+        :param destination: Destination switch DPID.
+        :return: Tuple of ports, either of which may be None.
+        """
+        edge = self._edge_ids[(self.node_ids[source], self.node_ids[destination])]
+        return self._src_port[edge], self._dst_port[edge]
+
+    def csr(self):
+        """
+        Get the CSR adjacency arrays.
+
+        :return: Tuple (indptr, indices, weights, edge_ids).
+        """
+        self._ensure_csr()
+        return self._indptr, self._indices, self._weights, self._csr_edges
+
+    def shortest_path(self, source, destination):
+        """
+        Compute the lowest-cost path between two switches.
+
+        :param source: Source switch DPID.
+        :param destination: Destination switch DPID.
+        :return: List of DPIDs along the path, or None if unreachable.
+        """
+        return self.shortest_paths([(source, destination)])[0]
+
+    def shortest_paths(self, pairs):
+        """
+        Compute shortest paths for many (source, destination) pairs at once.
+
+        Pairs are grouped by source so that a single Dijkstra run over the
+        CSR graph answers every destination for that source.
+
+        :param pairs: Iterable of (source, destination) DPID tuples.
+        :return: List of paths (lists of DPIDs, or None), in input order.
+        """
+        pairs = list(pairs)
+        sources = [self.node_ids.get(src) for src, _ in pairs]
+        missing = sorted({s for s in sources if s is not None and s not in self._tree_cache})
+
+        if missing:
+            self._ensure_csr()
+            dist, predecessors = dijkstra(self._graph, directed=True, indices=missing, return_predecessors=True)
+            for row, node in enumerate(missing):
+                self._tree_cache[node] = (dist[row], predecessors[row])
+
+        paths = []
+        for (_, dst), u in zip(pairs, sources):
+            v = self.node_ids.get(dst)
+            if u is None or v is None:
+                paths.append(None)
+                continue
+            paths.append(self._walk_tree(u, v))
+        return paths
+
+    def shortest_path_avoiding(self, source, destination, avoid_links):
+        """
+        Compute the lowest-cost path that does not use any of the given links.
+
+        :param source: Source switch DPID.
+        :param destination: Destination switch DPID.
+        :param avoid_links: Iterable of (source, destination) DPID tuples.
+        :return: List of DPIDs along the path, or None if unreachable.
+        """
+        u, v = self.node_ids.get(source), self.node_ids.get(destination)
+        if u is None or v is None:
+            return None
+        self._ensure_csr()
+        banned_edges = {(self.node_ids.get(a), self.node_ids.get(b)) for a, b in avoid_links}
+        path = self._dijkstra_path(u, v, set(), banned_edges)
+        return None if path is None else [self.node_names[n] for n in path]
+
+    def k_shortest_paths(self, source, destination, k):
+        """
+        Compute up to k loopless shortest paths using Yen's algorithm.
+
+        :param source: Source switch DPID.
+        :param destination: Destination switch DPID.
+        :param k: Maximum number of paths to return.
+        :return: List of (cost, path) tuples in increasing cost order.
+        """
+        first = self.shortest_path(source, destination)
+        if first is None:
+            return []
+
+        self._ensure_csr()
+        u, v = self.node_ids[source], self.node_ids[destination]
+        first = [self.node_ids[dpid] for dpid in first]
+        found = [(self._path_cost(first), first)]
+        candidates = []
+        seen = {tuple(first)}
+
+        while len(found) < k:
+            _, last = found[-1]
+            for i in range(len(last) - 1):
+                spur_node = last[i]
+                root = last[:i + 1]
+
+                banned_edges = set()
+                for _, path in found:
+                    if len(path) > i and path[:i + 1] == root:
+                        banned_edges.add((path[i], path[i + 1]))
+                banned_nodes = set(root[:-1])
+
+                spur = self._dijkstra_path(spur_node, v, banned_nodes, banned_edges)
+                if spur is None:
+                    continue
+                candidate = root[:-1] + spur
+                if tuple(candidate) not in seen:
+                    seen.add(tuple(candidate))
+                    heapq.heappush(candidates, (self._path_cost(candidate), candidate))
+
+            if not candidates:
+                break
+            found.append(heapq.heappop(candidates))
+
+        return [(cost, [self.node_names[n] for n in path]) for cost, path in found]
+
+    def _set_edge(self, u, v, capacity, src_port, dst_port):
+        edge = self._edge_ids.get((u, v))
+        if edge is not None:
+            self._src_port[edge] = src_port
+            self._dst_port[edge] = dst_port
+            self._update_capacity(edge, capacity)
+            return
+
+        if self._free_edges:
+            edge = self._free_edges.pop()
+            self._src[edge], self._dst[edge] = u, v
+            self._capacity[edge] = capacity
+            self._src_port[edge], self._dst_port[edge] = src_port, dst_port
+        else:
+            edge = len(self._src)
+            self._src.append(u)
+            self._dst.append(v)
+            self._capacity.append(capacity)
+            self._src_port.append(src_port)
+            self._dst_port.append(dst_port)
+        self._edge_ids[(u, v)] = edge
+        self._invalidate()
+
+    def _update_capacity(self, edge, capacity):
+        old_capacity = self._capacity[edge]
+        self._capacity[edge] = capacity
+        if self._indptr is not None:
+            self._weights[self._csr_position[edge]] = 1.0 / capacity
+
+        if capacity < old_capacity:
+            # A more expensive link only affects trees that route over it
+            self._drop_trees_using(self._src[edge], self._dst[edge])
+        elif capacity > old_capacity:
+            self._tree_cache.clear()
+
+    def _drop_trees_using(self, u, v):
+        stale = [node for node, (_, predecessors) in self._tree_cache.items() if predecessors[v] == u]
+        for node in stale:
+            del self._tree_cache[node]
+
+    def _invalidate(self):
+        self._indptr = None
+        self._tree_cache.clear()
+
+    def _ensure_csr(self):
+        if self._indptr is not None:
+            return
+
+        edges = np.fromiter(self._edge_ids.values(), dtype=np.int64, count=len(self._edge_ids))
+        src = np.asarray(self._src, dtype=np.int64)[edges] if len(edges) else np.empty(0, dtype=np.int64)
+        order = np.argsort(src, kind='stable')
+        edges = edges[order]
+
+        n = self.num_nodes
+        self._csr_edges = edges
+        self._indices = np.asarray(self._dst, dtype=np.int32)[edges] if len(edges) else np.empty(0, dtype=np.int32)
+        self._weights = 1.0 / np.asarray(self._capacity, dtype=np.float64)[edges] if len(edges) else np.empty(0)
+        self._indptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(src, minlength=n), out=self._indptr[1:])
+
+        self._csr_position = np.zeros(len(self._src), dtype=np.int64)
+        self._csr_position[edges] = np.arange(len(edges))
+        self._graph = csr_matrix((self._weights, self._indices, self._indptr), shape=(n, n))
+
+    def _walk_tree(self, u, v):
+        dist, predecessors = self._tree_cache[u]
+        if not np.isfinite(dist[v]):
+            return None
+        path = [v]
+        while v != u:
+            v = predecessors[v]
+            path.append(v)
+        return [self.node_names[n] for n in reversed(path)]
+
+    def _path_cost(self, path):
+        return sum(1.0 / self._capacity[self._edge_ids[(a, b)]] for a, b in zip(path, path[1:]))
+
+    def _dijkstra_path(self, u, v, banned_nodes, banned_edges):
+        indptr, indices, weights = self._indptr, self._indices, self._weights
+        dist = {u: 0.0}
+        previous = {}
+        heap = [(0.0, u)]
+        while heap:
+            d, node = heapq.heappop(heap)
+            if node == v:
+                path = [v]
+                while path[-1] != u:
+                    path.append(previous[path[-1]])
+                return path[::-1]
+            if d > dist[node]:
+                continue
+            for pos in range(indptr[node], indptr[node + 1]):
+                nxt = int(indices[pos])
+                if nxt in banned_nodes or (node, nxt) in banned_edges:
+                    continue
+                nd = d + weights[pos]
+                if nd < dist.get(nxt, np.inf):
+                    dist[nxt] = nd
+                    previous[nxt] = node
+                    heapq.heappush(heap, (nd, nxt))
+        return None
+
+def _check_capacity(capacity):
+    # Weights are 1 / capacity, so zero, negative, NaN or missing capacities have no valid weight
+    if not isinstance(capacity, Number) or isinstance(capacity, bool) or not capacity > 0:
+        raise ValueError(f"Link capacity must be a positive number, got {capacity!r}")
+
+# Example usage
+if __name__ == "__main__":
+    # Example topology as returned by the SDN controller
+    topology = {
+        "switches": [
+            {"id": "00:00:00:00:00:00:00:01"},
+            {"id": "00:00:00:00:00:00:00:02"},
+            {"id": "00:00:00:00:00:00:00:03"}
+        ],
+        "links": [
+            {"source": "00:00:00:00:00:00:00:01", "destination": "00:00:00:00:00:00:00:02", "capacity": 1000, "source_port": 2, "destination_port": 1},
+            {"source": "00:00:00:00:00:00:00:02", "destination": "00:00:00:00:00:00:00:03", "capacity": 1000, "source_port": 2, "destination_port": 1},
+            {"source": "00:00:00:00:00:00:00:01", "destination": "00:00:00:00:00:00:00:03", "capacity": 100, "source_port": 3, "destination_port": 2}
+        ]
+    }
+
+    # Build the index
+    index = TopologyIndex(topology)
+
+    # Query paths
+    print(f"Shortest path: {index.shortest_path('00:00:00:00:00:00:00:01', '00:00:00:00:00:00:00:03')}")
+    print(f"K-shortest paths: {index.k_shortest_paths('00:00:00:00:00:00:00:01', '00:00:00:00:00:00:00:03', 2)}")
+
+    # React to a link change
+    index.update_link_capacity("00:00:00:00:00:00:00:02", "00:00:00:00:00:00:00:03", 10)
+    print(f"Shortest path after update: {index.shortest_path('00:00:00:00:00:00:00:01', '00:00:00:00:00:00:00:03')}")
@@ -0,0 +1,62 @@
+import bisect
+import hashlib
+
+class HashRing:
+    """
+    Consistent hash ring with virtual nodes.
+
+    Each node is placed on the ring at `replicas` points, so adding or
+    removing a node only moves the keys that hash next to its points.
+    """
+
+    def __init__(self, nodes=(), replicas=100):
+        self.replicas = replicas
+        self.nodes = []
+        self._points = []
+        self._owners = []
+        for node in nodes:
+            self.add_node(node)
+
+    @staticmethod
+    def _hash(value):
+        return int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), 'big')
+
+    def add_node(self, node):
+        """
+        Add a node to the ring.
+
+        :param node: Node identifier.
+        """
+        if node in self.nodes:
+            return
+        self.nodes.append(node)
+        for replica in range(self.replicas):
+            point = self._hash(f"{node}#{replica}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove_node(self, node):
+        """
+        Remove a node from the ring.
+
+        :param node: Node identifier.
+        """
+        if node not in self.nodes:
+            return
+        self.nodes.remove(node)
+        kept = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [p for p, _ in kept]
+        self._owners = [o for _, o in kept]
+
+    def get_node(self, key):
+        """
+        Get the node owning a key.
+
+        :param key: Key to look up.
+        :return: Node identifier, or None if the ring is empty.
+        """
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, self._hash(key)) % len(self._points)
+        return self._owners[index]
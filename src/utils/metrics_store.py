@@ -0,0 +1,349 @@
+import glob
+import json
+import os
+import threading
+import time
+from numbers import Number
+
+import numpy as np
+
+class MetricsStore:
+    """
+    Append-only store for metrics history, kept in memory-mappable segment files.
+
+    Every sample value is a fixed-width binary record (timestamp, value,
+    series id, element index) appended to the active segment file. Series
+    names such as 'traffic.arrival_rates' are interned once in series.json.
+    Every index_interval-th record of a segment also adds a
+    (timestamp, position) entry to the segment's sparse index file.
+
+    Records are stamped with the local clock when they are appended, so
+    samples from different sources share one time base. Timestamps never
+    decrease, so a range query finds the overlapping segments from their
+    time bounds. It then narrows each one to a few index blocks and
+    binary-searches only those blocks of the memory-mapped segment.
+
+    Segments rotate after segment_records records or segment_duration
+    seconds, whichever comes first. The oldest segments are deleted once
+    there are more than max_segments of them, or once all their records
+    are older than max_age seconds. Retention is checked on open and on
+    every append.
+    """
+
+    RECORD_DTYPE = np.dtype([('timestamp', '<f8'), ('value', '<f8'), ('series', '<u4'), ('index', '<u4')])
+    INDEX_DTYPE = np.dtype([('timestamp', '<f8'), ('position', '<u8')])
+
+    def __init__(self, config):
+        self.config = config
+        self.directory = self.config.get('metrics_store.directory', 'data/metrics')
+        self.segment_records = self.config.get('metrics_store.segment_records', 1000000)
+        self.index_interval = self.config.get('metrics_store.index_interval', 1024)
+        self.max_segments = self.config.get('metrics_store.max_segments', 64)
+        self.max_age = self.config.get('metrics_store.max_age')
+        self.segment_duration = self.config.get('metrics_store.segment_duration')
+        if self.segment_duration is None and self.max_age is not None:
+            # Keep age-based deletion granular even when records arrive slowly
+            self.segment_duration = self.max_age / 10
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._series = {}
+        self._series_names = []
+        self._segments = []
+        self._file = None
+        self._index_file = None
+        self._load()
+        self._enforce_retention(time.time())
+
+    def append(self, name, values, timestamp=None):
+        """
+        Append one sample of a series.
+
+        :param name: Series name.
+        :param values: Scalar or array of per-element values.
+        :param timestamp: Sample time in seconds since the epoch (defaults to now;
+                          see append_many).
+        """
+        values = np.atleast_1d(np.asarray(values, dtype=np.float64)).ravel()
+        self.append_many({name: (np.arange(len(values)), values)}, timestamp)
+
+    def append_many(self, samples, timestamp=None):
+        """
+        Append samples of several series taken at the same time.
+
+        If the local clock steps back, records are stamped with the last stored
+        time instead. An explicit timestamp older than the last stored sample is
+        rejected.
+
+        :param samples: Dict of series name to (element indices, values).
+        :param timestamp: Sample time in seconds since the epoch (defaults to now).
+        """
+        explicit = timestamp is not None
+        timestamp = float(timestamp) if explicit else time.time()
+        with self._lock:
+            if self._segments and timestamp < self._segments[-1]['end']:
+                if explicit:
+                    raise ValueError(f"Metrics timestamp {timestamp} is older than the last stored sample.")
+                timestamp = self._segments[-1]['end']
+
+            parts = []
+            for name, (indices, values) in samples.items():
+                part = np.empty(len(values), dtype=self.RECORD_DTYPE)
+                part['series'] = self._series_id(name)
+                part['index'] = indices
+                part['value'] = values
+                parts.append(part)
+            if not parts:
+                return
+            records = np.concatenate(parts)
+            records['timestamp'] = timestamp
+
+            while len(records):
+                if self._needs_rotation(timestamp):
+                    self._rotate(timestamp)
+                elif self._file is None:
+                    self._open_active()
+                segment = self._segments[-1]
+                take = min(len(records), self.segment_records - segment['count'])
+                self._write(segment, records[:take])
+                records = records[take:]
+            self._enforce_retention(timestamp)
+
+    def record_sample(self, kind, sample, timestamp=None):
+        """
+        Append every numeric value of a JSON-like sample.
+
+        Nested keys are joined with dots under the kind, e.g. a traffic sample
+        {"arrival_rates": [...]} becomes series 'traffic.arrival_rates', and
+        the position in the innermost list becomes the element index. A
+        timestamp inside the sample (e.g. the controller's clock) is stored
+        as a value like any other field, not used as the record time.
+
+        :param kind: Sample kind, e.g. 'traffic', 'congestion' or 'allocation'.
+        :param sample: Dict of metrics.
+        :param timestamp: Sample time (defaults to now).
+        """
+        leaves = {}
+        for key, value in sample.items():
+            _flatten(f"{kind}.{key}", value, 0, leaves)
+        self.append_many({name: (np.asarray(indices), np.asarray(values, dtype=np.float64))
+                          for name, (indices, values) in leaves.items()}, timestamp)
+
+    def load_window(self, start=None, end=None, series=None):
+        """
+        Load the records in a time window into NumPy arrays.
+
+        :param start: Window start time, inclusive (defaults to the oldest record).
+        :param end: Window end time, inclusive (defaults to the newest record).
+        :param series: Series name or list of names (all series if omitted).
+        :return: Dict of series name to dict of 'timestamp', 'index' and 'value' arrays.
+        """
+        start = -np.inf if start is None else start
+        end = np.inf if end is None else end
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                self._index_file.flush()
+            segments = [dict(segment) for segment in self._segments
+                        if segment['count'] and segment['start'] <= end and segment['end'] >= start]
+            names = list(self._series_names)
+
+        chunks = [self._read_range(segment, start, end) for segment in segments]
+        records = np.concatenate(chunks) if chunks else np.empty(0, dtype=self.RECORD_DTYPE)
+
+        if series is None:
+            wanted = np.unique(records['series'])
+        else:
+            series = [series] if isinstance(series, str) else series
+            wanted = [self._series[name] for name in series if name in self._series]
+
+        window = {}
+        for series_id in wanted:
+            selected = records[records['series'] == series_id]
+            window[names[series_id]] = {
+                "timestamp": selected['timestamp'],
+                "index": selected['index'].astype(np.int64),
+                "value": selected['value']
+            }
+        return window
+
+    def series_names(self):
+        """
+        Get the names of all stored series.
+
+        :return: List of series names.
+        """
+        with self._lock:
+            return list(self._series_names)
+
+    def get_stats(self):
+        """
+        Get store size statistics.
+
+        :return: Dict with the number of segments, records and series, and the time range.
+        """
+        with self._lock:
+            return {
+                "segments": len(self._segments),
+                "records": int(sum(segment['count'] for segment in self._segments)),
+                "series": len(self._series_names),
+                "start": self._segments[0]['start'] if self._segments else None,
+                "end": self._segments[-1]['end'] if self._segments else None
+            }
+
+    def close(self):
+        """
+        Close the active segment files.
+        """
+        with self._lock:
+            self._close_active()
+
+    def _read_range(self, segment, start, end):
+        index = segment['index']
+        first, last = 0, segment['count']
+        if len(index):
+            block = np.searchsorted(index['timestamp'], start, side='left') - 1
+            if block > 0:
+                first = int(index['position'][block])
+            block = np.searchsorted(index['timestamp'], end, side='right')
+            if block < len(index):
+                last = int(index['position'][block])
+        if first >= last:
+            return np.empty(0, dtype=self.RECORD_DTYPE)
+
+        try:
+            records = np.memmap(segment['path'], dtype=self.RECORD_DTYPE, mode='r', shape=(segment['count'],))
+        except FileNotFoundError:
+            # Deleted by retention after the query picked it
+            return np.empty(0, dtype=self.RECORD_DTYPE)
+        blocks = records[first:last]
+        lo = np.searchsorted(blocks['timestamp'], start, side='left')
+        hi = np.searchsorted(blocks['timestamp'], end, side='right')
+        selected = np.array(blocks[lo:hi])
+        del records
+        return selected
+
+    def _write(self, segment, records):
+        position = segment['count'] + np.arange(len(records))
+        marks = position % self.index_interval == 0
+        if np.any(marks):
+            entries = np.empty(np.count_nonzero(marks), dtype=self.INDEX_DTYPE)
+            entries['timestamp'] = records['timestamp'][marks]
+            entries['position'] = position[marks]
+            self._index_file.write(entries.tobytes())
+            segment['index'] = np.concatenate([segment['index'], entries])
+
+        self._file.write(records.tobytes())
+        self._file.flush()
+        self._index_file.flush()
+        segment['count'] += len(records)
+        segment['end'] = float(records['timestamp'][-1])
+
+    def _needs_rotation(self, timestamp):
+        if not self._segments:
+            return True
+        segment = self._segments[-1]
+        if segment['count'] >= self.segment_records:
+            return True
+        return (self.segment_duration is not None and segment['count'] > 0
+                and timestamp - segment['start'] >= self.segment_duration)
+
+    def _rotate(self, timestamp):
+        self._close_active()
+        number = self._segments[-1]['number'] + 1 if self._segments else 0
+        path = os.path.join(self.directory, f"segment_{number:08d}.dat")
+        self._segments.append({
+            "number": number,
+            "path": path,
+            "count": 0,
+            "start": timestamp,
+            "end": timestamp,
+            "index": np.empty(0, dtype=self.INDEX_DTYPE)
+        })
+        self._open_active()
+
+    def _open_active(self):
+        path = self._segments[-1]['path']
+        self._file = open(path, 'ab')
+        self._index_file = open(path[:-4] + '.idx', 'ab')
+
+    def _enforce_retention(self, now):
+        expired = 0
+        while len(self._segments) - expired > 1:
+            segment = self._segments[expired]
+            too_many = len(self._segments) - expired > self.max_segments
+            too_old = self.max_age is not None and segment['end'] < now - self.max_age
+            if not (too_many or too_old):
+                break
+            expired += 1
+
+        for segment in self._segments[:expired]:
+            for path in (segment['path'], segment['path'][:-4] + '.idx'):
+                if os.path.exists(path):
+                    os.remove(path)
+        del self._segments[:expired]
+
+    def _close_active(self):
+        for handle in (self._file, self._index_file):
+            if handle is not None:
+                handle.close()
+        self._file = self._index_file = None
+
+    def _series_id(self, name):
+        series_id = self._series.get(name)
+        if series_id is None:
+            series_id = len(self._series_names)
+            self._series[name] = series_id
+            self._series_names.append(name)
+            path = os.path.join(self.directory, 'series.json')
+            with open(path + '.tmp', 'w') as f:
+                json.dump(self._series_names, f)
+            os.replace(path + '.tmp', path)
+        return series_id
+
+    def _load(self):
+        path = os.path.join(self.directory, 'series.json')
+        if os.path.exists(path):
+            with open(path) as f:
+                self._series_names = json.load(f)
+            self._series = {name: i for i, name in enumerate(self._series_names)}
+
+        for path in sorted(glob.glob(os.path.join(self.directory, 'segment_*.dat'))):
+            # Drop a partially written trailing record left by a crash
+            count = os.path.getsize(path) // self.RECORD_DTYPE.itemsize
+            if os.path.getsize(path) != count * self.RECORD_DTYPE.itemsize:
+                os.truncate(path, count * self.RECORD_DTYPE.itemsize)
+            if count == 0:
+                continue
+
+            records = np.memmap(path, dtype=self.RECORD_DTYPE, mode='r', shape=(count,))
+            start, end = float(records['timestamp'][0]), float(records['timestamp'][-1])
+            del records
+            index_path = path[:-4] + '.idx'
+            index = np.fromfile(index_path, dtype=self.INDEX_DTYPE) if os.path.exists(index_path) else np.empty(0, dtype=self.INDEX_DTYPE)
+            if np.any(index['position'] >= count):
+                index = index[index['position'] < count]
+                index.tofile(index_path)
+            self._segments.append({
+                "number": int(os.path.basename(path)[8:-4]),
+                "path": path,
+                "count": count,
+                "start": start,
+                "end": end,
+                "index": index
+            })
+
+def _is_number(value):
+    return isinstance(value, Number) and not isinstance(value, bool)
+
+def _flatten(name, value, index, leaves):
+    if _is_number(value):
+        indices, values = leaves.setdefault(name, ([], []))
+        indices.append(index)
+        values.append(value)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            _flatten(f"{name}.{key}", item, index, leaves)
+    elif isinstance(value, (list, tuple)):
+        for i, item in enumerate(value):
+            _flatten(name, item, i, leaves)
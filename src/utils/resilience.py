@@ -0,0 +1,275 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlsplit
+
+import numpy as np
+import requests
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised when a call is rejected because the controller's circuit is open."""
+
+class LatencyTracker:
+    """
+    Sliding window of recent request latencies for one endpoint.
+    """
+
+    def __init__(self, window=100):
+        self._samples = np.zeros(window)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def record(self, latency):
+        with self._lock:
+            self._samples[self._count % len(self._samples)] = latency
+            self._count += 1
+
+    def __len__(self):
+        return min(self._count, len(self._samples))
+
+    def percentile(self, q):
+        with self._lock:
+            n = len(self)
+            if n == 0:
+                return None
+            return float(np.percentile(self._samples[:n], q))
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    are rejected for reset_timeout seconds. A single trial call is then let
+    through (half-open); its outcome closes or reopens the circuit.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=10.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    @property
+    def is_open(self):
+        with self._lock:
+            return self.state != self.CLOSED
+
+class ControllerClient:
+    """
+    HTTP client for SDN controller REST calls with per-endpoint timeouts,
+    hedged GETs and a circuit breaker per controller.
+
+    Each endpoint path (e.g. '/network/status') has a latency budget used as
+    the request timeout. Once an endpoint has enough latency samples, a GET
+    that is still outstanding after the endpoint's p95 latency is duplicated
+    and the first successful response wins. Transport errors and 5xx
+    responses count as failures towards the breaker of the controller that
+    served them. While a breaker is open, calls fail fast with
+    CircuitOpenError, and GETs made with fallback=True return the last
+    known good response instead.
+    """
+
+    def __init__(self, config, logger):
+        self.config = config
+        self.logger = logger
+        self.default_timeout = self.config.get('resilience.default_timeout', 5.0)
+        self.timeouts = self.config.get('resilience.timeouts', {})
+        self.hedge = self.config.get('resilience.hedge', True)
+        self.hedge_min_samples = self.config.get('resilience.hedge_min_samples', 20)
+        self.hedge_percentile = self.config.get('resilience.hedge_percentile', 95)
+        self.latency_window = self.config.get('resilience.latency_window', 100)
+        self.failure_threshold = self.config.get('resilience.failure_threshold', 5)
+        self.reset_timeout = self.config.get('resilience.reset_timeout', 10.0)
+
+        self._executor = ThreadPoolExecutor(max_workers=self.config.get('resilience.max_workers', 8))
+        self._latencies = {}
+        self._breakers = {}
+        self._last_good = {}
+        self._lock = threading.Lock()
+
+    def timeout_for(self, url):
+        """
+        Get the latency budget for the endpoint of a URL.
+
+        :param url: Request URL.
+        :return: Timeout in seconds.
+        """
+        return self.timeouts.get(urlsplit(url).path, self.default_timeout)
+
+    def breaker_for(self, url):
+        """
+        Get the circuit breaker of the controller serving a URL.
+
+        :param url: Request URL.
+        :return: CircuitBreaker instance.
+        """
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            breaker = self._breakers.get(origin)
+            if breaker is None:
+                breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self._breakers[origin] = breaker
+            return breaker
+
+    def latency_for(self, url):
+        """
+        Get the latency tracker for the endpoint of a URL.
+
+        :param url: Request URL.
+        :return: LatencyTracker instance.
+        """
+        path = urlsplit(url).path
+        with self._lock:
+            tracker = self._latencies.get(path)
+            if tracker is None:
+                tracker = LatencyTracker(self.latency_window)
+                self._latencies[path] = tracker
+            return tracker
+
+    def get_json(self, url, fallback=False, **kwargs):
+        """
+        GET a JSON resource, hedging the request when it runs slow.
+
+        :param url: Request URL.
+        :param fallback: Return the last known good value while the circuit is open.
+        :return: Decoded JSON response.
+        """
+        breaker = self.breaker_for(url)
+        if not breaker.allow():
+            return self._fallback(url, fallback)
+
+        try:
+            response = self._with_breaker(breaker, self._hedged_get, url, **kwargs)
+            data = response.json()
+        except requests.exceptions.RequestException:
+            if fallback and breaker.is_open and url in self._last_good:
+                return self._fallback(url, fallback)
+            raise
+
+        self._last_good[url] = data
+        return data
+
+    def post(self, url, **kwargs):
+        """
+        POST to the controller within the endpoint's latency budget.
+
+        :param url: Request URL.
+        :return: requests.Response
+        """
+        return self._call('post', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        """
+        PUT to the controller within the endpoint's latency budget.
+
+        :param url: Request URL.
+        :return: requests.Response
+        """
+        return self._call('put', url, **kwargs)
+
+    def _call(self, method, url, **kwargs):
+        breaker = self.breaker_for(url)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {url}")
+        return self._with_breaker(breaker, self._send, method, url, self.timeout_for(url), **kwargs)
+
+    @staticmethod
+    def _with_breaker(breaker, func, *args, **kwargs):
+        # One breaker outcome per logical request, however many attempts it made
+        try:
+            response = func(*args, **kwargs)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        except requests.exceptions.RequestException:
+            breaker.record_failure()
+            raise
+        except Exception:
+            # Anything else still ends the half-open trial, or it would stay in flight forever
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        return response
+
+    def _send(self, method, url, timeout, **kwargs):
+        start = time.monotonic()
+        response = requests.request(method, url, timeout=timeout, **kwargs)
+        response.raise_for_status()
+        self.latency_for(url).record(time.monotonic() - start)
+        return response
+
+    def _hedged_get(self, url, **kwargs):
+        budget = self.timeout_for(url)
+        tracker = self.latency_for(url)
+        hedge_delay = None
+        if self.hedge and len(tracker) >= self.hedge_min_samples:
+            hedge_delay = tracker.percentile(self.hedge_percentile)
+        if hedge_delay is None or hedge_delay >= budget:
+            return self._send('get', url, budget, **kwargs)
+
+        # The budget bounds the whole call, so the hedge only gets what is left
+        deadline = time.monotonic() + budget
+        futures = {self._executor.submit(self._send, 'get', url, budget, **kwargs)}
+        done, _ = wait(futures, timeout=hedge_delay)
+        remaining = deadline - time.monotonic()
+        if not done and remaining > 0:
+            self.logger.debug(f"Hedging GET {url} after {hedge_delay:.3f}s")
+            futures.add(self._executor.submit(self._send, 'get', url, remaining, **kwargs))
+
+        error = None
+        pending = futures
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return future.result()
+                except requests.exceptions.RequestException as e:
+                    error = e
+        if pending:
+            raise requests.exceptions.Timeout(f"GET {url} exceeded its {budget:.3f}s budget")
+        raise error
+
+    def _fallback(self, url, fallback):
+        if fallback and url in self._last_good:
+            self.logger.warning(f"Controller unhealthy, serving last known good value for {url}")
+            return self._last_good[url]
+        raise CircuitOpenError(f"Circuit open for {url}")
@@ -0,0 +1,155 @@
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+class SharedStateBus:
+    """
+    Shared-memory state shared by the monitor, allocator and flow-pusher processes.
+
+    The block holds one float64 array per field, each with room for
+    `capacity` nodes, plus a sequence counter and a length per field.
+    Writers follow the seqlock protocol. They make the counter odd, write
+    the data and then make it even again. Readers take no lock. They copy
+    (or use) the data between two counter reads and retry if a counter
+    was odd or changed in between.
+
+    Each field must have a single writer process. Different processes may
+    write different fields, e.g. the monitor writes arrival_rates and the
+    allocator writes allocations and traffic_intensities.
+    """
+
+    FIELDS = ('arrival_rates', 'allocations', 'traffic_intensities')
+    MAGIC = 0x44524153
+
+    def __init__(self, name=None, capacity=1024, create=False):
+        num_fields = len(self.FIELDS)
+        if create:
+            size = 8 * (3 + 2 * num_fields + num_fields * capacity)
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        elif sys.version_info >= (3, 13):
+            self.shm = shared_memory.SharedMemory(name=name, track=False)
+            capacity = int(np.ndarray((3,), dtype=np.int64, buffer=self.shm.buf)[1])
+        else:
+            # Attaching registers the block with this process's resource
+            # tracker, which would unlink it when this process exits
+            self.shm = shared_memory.SharedMemory(name=name)
+            resource_tracker.unregister(self.shm._name, 'shared_memory')
+            capacity = int(np.ndarray((3,), dtype=np.int64, buffer=self.shm.buf)[1])
+
+        self.name = self.shm.name
+        self.capacity = capacity
+        self._header = np.ndarray((3,), dtype=np.int64, buffer=self.shm.buf)
+        self._meta = np.ndarray((num_fields, 2), dtype=np.uint64, buffer=self.shm.buf, offset=8 * 3)
+        self._data = np.ndarray((num_fields, capacity), dtype=np.float64, buffer=self.shm.buf, offset=8 * (3 + 2 * num_fields))
+        self._index = {field: i for i, field in enumerate(self.FIELDS)}
+
+        if create:
+            self._header[:] = (self.MAGIC, capacity, num_fields)
+            self._meta[:] = 0
+        elif self._header[0] != self.MAGIC:
+            raise ValueError(f"Shared memory block {name} is not a state bus.")
+
+    @classmethod
+    def create(cls, name=None, capacity=1024):
+        """
+        Create a new state bus.
+
+        :param name: Shared memory block name (random if omitted).
+        :param capacity: Maximum number of nodes per field.
+        :return: SharedStateBus
+        """
+        return cls(name=name, capacity=capacity, create=True)
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Attach to an existing state bus.
+
+        :param name: Shared memory block name.
+        :return: SharedStateBus
+        """
+        return cls(name=name)
+
+    def write(self, **fields):
+        """
+        Publish new values for one or more fields atomically.
+
+        :param fields: Field name to array of per-node values.
+        """
+        rows = [(self._index[field], np.asarray(values, dtype=np.float64)) for field, values in fields.items()]
+        for _, values in rows:
+            if len(values) > self.capacity:
+                raise ValueError(f"State bus capacity {self.capacity} exceeded: {len(values)} nodes")
+
+        for row, _ in rows:
+            self._meta[row, 0] += 1
+        for row, values in rows:
+            self._data[row, :len(values)] = values
+            self._meta[row, 1] = len(values)
+        for row, _ in rows:
+            self._meta[row, 0] += 1
+
+    def read(self, *fields):
+        """
+        Read a consistent copy of one or more fields.
+
+        :param fields: Field names (all fields if omitted).
+        :return: Dict of field name to array copy, plus 'versions'.
+        """
+        return self.read_with(lambda **views: {field: view.copy() for field, view in views.items()}, *fields)
+
+    def read_with(self, func, *fields, timeout=1.0):
+        """
+        Call func on zero-copy, read-only views of the fields, retrying until
+        the views were not written to during the call.
+
+        func may run more than once and must not keep the views.
+
+        :param func: Function taking the fields as keyword arguments.
+        :param fields: Field names (all fields if omitted).
+        :param timeout: Seconds to keep retrying before giving up.
+        :return: Dict of func's result merged with 'versions', or the
+                 result itself if it is not a dict.
+        """
+        rows = [self._index[field] for field in (fields or self.FIELDS)]
+        deadline = time.monotonic() + timeout
+        while True:
+            before = self._meta[rows, 0].copy()
+            if not np.any(before & 1):
+                lengths = self._meta[rows, 1].astype(np.intp)
+                views = {}
+                for row, length in zip(rows, lengths):
+                    view = self._data[row, :length]
+                    view.flags.writeable = False
+                    views[self.FIELDS[row]] = view
+                result = func(**views)
+                if np.array_equal(before, self._meta[rows, 0]):
+                    if isinstance(result, dict):
+                        result['versions'] = {self.FIELDS[row]: int(seq) // 2 for row, seq in zip(rows, before)}
+                    return result
+            if time.monotonic() > deadline:
+                raise TimeoutError("Timed out waiting for a consistent state bus read.")
+
+    def version(self, field):
+        """
+        Get the number of completed writes to a field.
+
+        :param field: Field name.
+        :return: Write count.
+        """
+        return int(self._meta[self._index[field], 0]) // 2
+
+    def close(self):
+        """
+        Detach from the shared memory block.
+        """
+        self._header = self._meta = self._data = None
+        self.shm.close()
+
+    def unlink(self):
+        """
+        Destroy the shared memory block; call once, from the creating process.
+        """
+        self.shm.unlink()
@@ -0,0 +1,54 @@
+import os
+import sys
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+# Manual connectivity check against a running controller, not a pytest test
+collect_ignore = ['test_connection.py']
+
+from config.config import Config
+from stub_controller import StubController
+
+@pytest.fixture
+def make_config(tmp_path):
+    """
+    Build a Config from overrides, logging into the test's temporary directory.
+    """
+    def make(overrides=None):
+        config = Config()
+        config.update_config({"logging": {"log_file": str(tmp_path / 'logs' / 'test.log'), "log_level": "DEBUG"}})
+        config.update_config(overrides or {})
+        return config
+    return make
+
+@pytest.fixture
+def stub():
+    """
+    Stub SDN controller serving on a free local port for the duration of the test.
+    """
+    stub = StubController()
+    stub.start()
+    yield stub
+    stub.stop()
+
+class RecordingNetworkManager:
+    """
+    NetworkManager stand-in that records node batches and resource allocations instead of sending them.
+    """
+
+    def __init__(self):
+        self.batches = []
+        self.allocations = []
+
+    def manage_nodes(self, nodes):
+        self.batches.append(nodes)
+
+    def allocate_resources(self, resource_allocation):
+        self.allocations.append(resource_allocation)
+
+@pytest.fixture
+def network_manager():
+    return RecordingNetworkManager()
@@ -0,0 +1,103 @@
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class StubController:
+    """
+    Local stand-in for the SDN controller REST API with injectable latency
+    and failures, for exercising timeouts, hedging and circuit breaking.
+
+    :param port: Port to listen on (0 picks a free port).
+    :param latency: Seconds of delay per path, or a single delay for all paths.
+    :param jitter: Extra random delay of up to this many seconds.
+    :param failure_rate: Probability of answering with HTTP 503.
+    """
+
+    def __init__(self, port=0, latency=0.0, jitter=0.0, failure_rate=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.requests = []
+        self.responses = {
+            "/topology": {"switches": [], "links": []},
+            "/network/status": {"status": "ok"},
+            "/network/traffic": {},
+            "/network/congestion": {}
+        }
+        self.server = ThreadingHTTPServer(('localhost', port), self._handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://localhost:{self.server.server_address[1]}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _delay(self, path):
+        latency = self.latency.get(path, 0.0) if isinstance(self.latency, dict) else self.latency
+        return latency + random.uniform(0, self.jitter)
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self):
+                stub.requests.append((self.command, self.path))
+                time.sleep(stub._delay(self.path))
+                length = int(self.headers.get('Content-Length', 0))
+                if length:
+                    self.rfile.read(length)
+
+                if random.random() < stub.failure_rate:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+
+                body = json.dumps(stub.responses.get(self.path, {})).encode()
+                try:
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up waiting (timeout or losing hedge)
+                    pass
+
+            do_GET = _respond
+            do_POST = _respond
+            do_PUT = _respond
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub SDN controller with injected latency.")
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    stub = StubController(args.port, args.latency, args.jitter, args.failure_rate)
+    print(f"Stub controller listening on {stub.base_url}")
+    stub.server.serve_forever()
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from algorithms.admission_control import AdmissionControl
+
+ALLOCATIONS = np.array([100.0, 100.0, 300.0, 400.0])
+
+def mean_delay(arrival_rates, allocations, alpha=0.1):
+    # Little's law over M/M/1 queues: total number in system / total throughput
+    rho = arrival_rates / (alpha * allocations)
+    return np.sum(rho / (1 - rho)) / np.sum(arrival_rates)
+
+@pytest.fixture
+def make_admission_control(make_config):
+    def make(delay_budget=None):
+        config = make_config({"result_cache": {"enabled": False},
+                              "admission_control": {"delay_budget": delay_budget}})
+        return AdmissionControl(config)
+    return make
+
+def test_utilization_bound_is_closed_form(make_admission_control):
+    scaling = make_admission_control().max_admissible_scaling([5, 5, 15, 10], [1, 1, 2, 2], ALLOCATIONS)
+    np.testing.assert_allclose(scaling['node_scales'], [1.98, 1.98, 1.98, 3.96])
+    assert scaling['global_scale'] == pytest.approx(1.98)
+    assert scaling['class_scales'] == {1: pytest.approx(1.98), 2: pytest.approx(1.98)}
+    assert scaling['capacity_scale'] == pytest.approx(0.99 * 0.1 * 1000 / 35)
+
+def test_delay_budget_scale_is_tight(make_admission_control):
+    arrival_rates = np.array([1.0, 1.0, 30.0, 40.0])
+    scaling = make_admission_control(delay_budget=0.5).max_admissible_scaling(arrival_rates, [1, 1, 2, 2], ALLOCATIONS)
+    scale = scaling['global_scale']
+    assert mean_delay(arrival_rates * scale, ALLOCATIONS) <= 0.5
+    assert mean_delay(arrival_rates * scale * 1.001, ALLOCATIONS) > 0.5
+
+def test_delay_budget_can_put_a_class_below_global(make_admission_control):
+    # Class 2 holds the loaded nodes; globally the light class 1 dilutes the mean delay
+    scaling = make_admission_control(delay_budget=0.5).max_admissible_scaling([1, 1, 30, 40], [1, 1, 2, 2], ALLOCATIONS)
+    assert scaling['class_scales'][2] < scaling['global_scale'] < scaling['class_scales'][1]
+
+@pytest.mark.filterwarnings('error')
+def test_zero_arrival_nodes_do_not_warn(make_admission_control):
+    scaling = make_admission_control(delay_budget=0.5).max_admissible_scaling([0, 0, 30, 40], [1, 1, 2, 2], ALLOCATIONS)
+    assert scaling['class_scales'][1] == np.inf
+    assert np.isfinite(scaling['global_scale'])
+    assert scaling['node_scales'][0] == np.inf
@@ -0,0 +1,83 @@
+import pytest
+
+from controllers.congestion_rerouter import CongestionRerouter
+from controllers.sdn_controller import SDNController
+from network.topology_index import TopologyIndex
+
+@pytest.fixture
+def rerouter(make_config):
+    sdn_controller = SDNController(make_config())
+    index = TopologyIndex()
+    # A-B-C is preferred (higher capacity), A-D-C has the same hop count
+    index.add_link('A', 'B', capacity=2, src_port=1, dst_port=1)
+    index.add_link('B', 'C', capacity=2, src_port=2, dst_port=1)
+    index.add_link('A', 'D', capacity=1, src_port=2, dst_port=1)
+    index.add_link('D', 'C', capacity=1, src_port=2, dst_port=2)
+    sdn_controller.topology_index = index
+
+    pushed = []
+    sdn_controller.manage_flow_table = pushed.append
+    rerouter = CongestionRerouter(sdn_controller, sdn_controller.config)
+    rerouter.pushed = pushed
+    return rerouter
+
+def test_install_tracks_links(rerouter):
+    rerouter.install_flows([{"name": "f", "source": "A", "destination": "C", "in_port": 9, "out_port": 9}])
+    assert rerouter.flows['f']['path'] == ['A', 'B', 'C']
+    assert rerouter.link_flows[('A', 'B')] == {'f'}
+    assert rerouter.link_flows[('B', 'C')] == {'f'}
+
+def test_reroute_with_same_hop_count_deactivates_old_switch_entry(rerouter):
+    rerouter.install_flows([{"name": "f", "source": "A", "destination": "C", "in_port": 9, "out_port": 9}])
+    summary = rerouter.on_congestion({"links": [{"source": "A", "destination": "B", "utilization": 0.95}]})
+
+    assert summary['rerouted'] == ['f']
+    assert rerouter.flows['f']['path'] == ['A', 'D', 'C']
+    mods = {(entry['switch'], entry['name']): entry for entry in rerouter.pushed[-1]}
+    assert mods[('B', 'f_1')]['active'] == "false"
+    assert mods[('D', 'f_1')]['active'] == "true"
+    assert mods[('A', 'f_0')]['actions'] == "output=2"
+    assert ('C', 'f_2') in mods
+    assert 'f' not in rerouter.link_flows[('A', 'B')]
+    assert rerouter.link_flows[('A', 'D')] == {'f'}
+
+def test_unaffected_flows_are_left_alone(rerouter):
+    rerouter.install_flows([
+        {"name": "f", "source": "A", "destination": "C", "in_port": 9, "out_port": 9},
+        {"name": "g", "source": "A", "destination": "D", "in_port": 9, "out_port": 9}
+    ])
+    summary = rerouter.on_congestion({"links": [{"source": "B", "destination": "C", "utilization": 0.9}]})
+    assert summary['affected_flows'] == ['f']
+    assert all(entry['name'].startswith('f_') for entry in rerouter.pushed[-1])
+
+def test_reallocation_is_applied_for_rerouted_flows(rerouter, make_config, network_manager):
+    from algorithms.resource_allocation import ResourceAllocation
+
+    rerouter.resource_allocator = ResourceAllocation(make_config({"result_cache": {"enabled": False}}))
+    rerouter.network_manager = network_manager
+    rerouter.install_flows([
+        {"name": "f", "source": "A", "destination": "C", "in_port": 9, "out_port": 9, "arrival_rate": 10, "allocation": 300},
+        {"name": "g", "source": "A", "destination": "C", "in_port": 8, "out_port": 8, "arrival_rate": 20, "allocation": 300}
+    ])
+    summary = rerouter.on_congestion({"links": [{"source": "A", "destination": "B", "utilization": 0.95}]})
+
+    assert summary['reallocated'] == ['f', 'g']
+    applied = rerouter.network_manager.allocations[-1]['resources']
+    assert [a['id'] for a in applied] == ['f', 'g']
+    assert sum(a['allocated'] for a in applied) == pytest.approx(600)
+    assert rerouter.flows['f']['flow']['allocation'] == applied[0]['allocated']
+
+def test_no_reallocation_without_reroute(rerouter, make_config, network_manager):
+    from algorithms.resource_allocation import ResourceAllocation
+
+    rerouter.resource_allocator = ResourceAllocation(make_config())
+    rerouter.network_manager = network_manager
+    rerouter.sdn_controller.topology_index.add_link('D', 'E', src_port=3, dst_port=1)
+    rerouter.install_flows([
+        {"name": "f", "source": "A", "destination": "E", "in_port": 9, "out_port": 9, "arrival_rate": 10, "allocation": 300},
+        {"name": "g", "source": "A", "destination": "E", "in_port": 8, "out_port": 8, "arrival_rate": 20, "allocation": 300}
+    ])
+    # D-E is the only way to reach E, so nothing can be rerouted
+    summary = rerouter.on_congestion({"links": [{"source": "D", "destination": "E", "utilization": 0.95}]})
+    assert summary['rerouted'] == []
+    assert rerouter.network_manager.allocations == []
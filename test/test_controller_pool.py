@@ -0,0 +1,48 @@
+import logging
+
+import pytest
+
+from controllers.controller_pool import ControllerPool
+
+URLS = ["http://c1:8080", "http://c2:8080", "http://c3:8080"]
+DPIDS = [f"00:00:00:00:00:00:00:{i:02x}" for i in range(200)]
+
+@pytest.fixture
+def pool(make_config):
+    return ControllerPool(make_config({"network": {"controllers": URLS}}), logging.getLogger('ControllerPoolTest'))
+
+def test_partition_groups_items_by_owner(pool):
+    shards = pool.partition([{"id": dpid} for dpid in DPIDS], key=lambda node: node['id'])
+    assert set(shards) == set(URLS)
+    assert sum(len(items) for items in shards.values()) == len(DPIDS)
+    for url, items in shards.items():
+        assert all(pool.owner(item['id']) == url for item in items)
+
+def test_add_and_remove_controller_report_moved_switches(pool):
+    before = {dpid: pool.owner(dpid) for dpid in DPIDS}
+    moved = pool.add_controller("http://c4:8080/")
+    assert moved and all(new == "http://c4:8080" for _, new in moved.values())
+    assert all(before[dpid] == old for dpid, (old, _) in moved.items())
+
+    moved_back = pool.remove_controller("http://c4:8080")
+    assert set(moved_back) == set(moved)
+    assert {dpid: pool.owner(dpid) for dpid in DPIDS} == before
+
+def test_last_controller_cannot_be_removed(make_config):
+    pool = ControllerPool(make_config({"network": {"controllers": URLS[:1]}}), logging.getLogger('ControllerPoolTest'))
+    with pytest.raises(ValueError):
+        pool.remove_controller(URLS[0])
+    assert pool.owner(DPIDS[0]) == URLS[0]
+
+def test_run_parallel_collects_errors_per_shard(pool):
+    calls = []
+
+    def put(url, items):
+        calls.append((url, items))
+        if url == URLS[1]:
+            raise ConnectionError("down")
+
+    errors = pool.run_parallel({url: [url] for url in URLS}, put)
+    assert sorted(calls) == [(url, [url]) for url in URLS]
+    assert list(errors) == [URLS[1]]
+    assert isinstance(errors[URLS[1]], ConnectionError)
@@ -0,0 +1,42 @@
+from utils.hash_ring import HashRing
+
+KEYS = [f"00:00:00:00:00:00:{i // 256:02x}:{i % 256:02x}" for i in range(5000)]
+
+def owners(ring):
+    return {key: ring.get_node(key) for key in KEYS}
+
+def test_ring_is_deterministic_and_order_independent():
+    first = owners(HashRing(["a", "b", "c"]))
+    assert owners(HashRing(["a", "b", "c"])) == first
+    assert owners(HashRing(["c", "a", "b"])) == first
+
+def test_keys_spread_over_all_nodes():
+    counts = {}
+    for node in owners(HashRing(["a", "b", "c", "d"])).values():
+        counts[node] = counts.get(node, 0) + 1
+    assert set(counts) == {"a", "b", "c", "d"}
+    assert min(counts.values()) > len(KEYS) / 4 * 0.6
+
+def test_adding_a_node_only_moves_keys_to_it():
+    ring = HashRing(["a", "b", "c", "d"])
+    before = owners(ring)
+    ring.add_node("e")
+    after = owners(ring)
+    moved = [key for key in KEYS if before[key] != after[key]]
+    assert all(after[key] == "e" for key in moved)
+    # Ideally 1/5 of the keys move
+    assert 0.1 < len(moved) / len(KEYS) < 0.3
+
+def test_removing_a_node_only_moves_its_keys():
+    ring = HashRing(["a", "b", "c", "d"])
+    before = owners(ring)
+    ring.remove_node("b")
+    after = owners(ring)
+    moved = [key for key in KEYS if before[key] != after[key]]
+    assert sorted(moved) == sorted(key for key in KEYS if before[key] == "b")
+    assert "b" not in after.values()
+
+def test_empty_ring_has_no_owner():
+    ring = HashRing(["a"])
+    ring.remove_node("a")
+    assert ring.get_node("x") is None
@@ -0,0 +1,51 @@
+import pytest
+
+from network.network_monitor import NetworkMonitor
+from utils.metrics_store import MetricsStore
+from utils.state_bus import SharedStateBus
+
+@pytest.fixture
+def monitor(stub, make_config):
+    bus = SharedStateBus.create(capacity=4)
+    host, port = stub.server.server_address
+    monitor = NetworkMonitor(make_config({"network": {"host": host, "port": port}}), state_bus=bus)
+    yield monitor
+    bus.close()
+    bus.unlink()
+
+def test_traffic_is_published_to_state_bus(stub, monitor):
+    stub.responses['/network/traffic'] = {"arrival_rates": [1.0, 2.0]}
+    assert monitor.monitor_traffic() == {"arrival_rates": [1.0, 2.0]}
+    assert list(monitor.state_bus.read('arrival_rates')['arrival_rates']) == [1.0, 2.0]
+
+@pytest.mark.parametrize("arrival_rates", [[1.0] * 5, {"n1": 1.0}, [[1.0], [2.0]], "fast"])
+def test_state_bus_write_errors_do_not_fail_monitoring(stub, monitor, arrival_rates):
+    stub.responses['/network/traffic'] = {"arrival_rates": arrival_rates}
+    assert monitor.monitor_traffic() == {"arrival_rates": arrival_rates}
+    assert monitor.state_bus.version('arrival_rates') == 0
+
+@pytest.fixture
+def recording_monitor(stub, make_config, tmp_path):
+    host, port = stub.server.server_address
+    config = make_config({"network": {"host": host, "port": port},
+                          "resilience": {"hedge": False, "failure_threshold": 1, "reset_timeout": 60},
+                          "metrics_store": {"directory": str(tmp_path / 'metrics')}})
+    store = MetricsStore(config)
+    yield NetworkMonitor(config, metrics_store=store)
+    store.close()
+
+def test_fallback_responses_are_not_recorded(stub, recording_monitor):
+    stub.responses['/network/congestion'] = {"congested_links": 3}
+    recording_monitor.monitor_congestion()
+    assert recording_monitor.metrics_store.get_stats()['records'] == 1
+
+    # The failure opens the circuit, and both calls are answered from the last good value
+    stub.failure_rate = 1.0
+    for _ in range(2):
+        assert recording_monitor.monitor_congestion() == {"congested_links": 3}
+    assert recording_monitor.metrics_store.get_stats()['records'] == 1
+
+def test_non_object_responses_are_not_recorded(stub, recording_monitor):
+    stub.responses['/network/traffic'] = [1.0, 2.0]
+    assert recording_monitor.monitor_traffic() == [1.0, 2.0]
+    assert recording_monitor.metrics_store.get_stats()['records'] == 0
@@ -0,0 +1,79 @@
+import time
+
+import pytest
+
+from network.network_manager import NodeManagementError
+from network.node_update_buffer import NodeUpdateBuffer
+
+@pytest.fixture
+def buffer(make_config, network_manager):
+    config = make_config({"node_updates": {"max_batch_size": 10, "max_delay": 0.2, "max_pending": 100}})
+    return NodeUpdateBuffer(network_manager, config)
+
+def test_merge_rules(buffer):
+    buffer.submit_many([
+        {"id": "a", "action": "add", "ports": 4},
+        {"id": "a", "action": "update", "ports": 8},
+        {"id": "b", "action": "remove"},
+        {"id": "b", "action": "add", "ports": 2},
+        {"id": "c", "action": "update", "ports": 1},
+        {"id": "c", "action": "remove"},
+        {"id": "d", "action": "add"},
+        {"id": "d", "action": "remove"}
+    ])
+    assert buffer.flush() == 3
+    assert buffer.network_manager.batches == [[
+        {"id": "a", "action": "add", "ports": 8},
+        {"id": "b", "action": "update", "ports": 2},
+        {"id": "c", "action": "remove"}
+    ]]
+    assert buffer.get_metrics()['cancelled'] == 1
+
+def test_cancellation_resets_pending_age(buffer):
+    buffer.submit({"id": "a", "action": "add"})
+    buffer.submit({"id": "a", "action": "remove"})
+    assert buffer.get_metrics()['pending'] == 0
+    assert buffer._next_flush() is None
+
+    time.sleep(0.3)
+    buffer.submit({"id": "b", "action": "add"})
+    # b is new, so it is not due before its own max_delay
+    assert buffer._next_flush() > time.monotonic() + 0.1
+
+def test_background_flush_after_max_delay(buffer):
+    buffer.start()
+    try:
+        buffer.submit({"id": "a", "action": "add"})
+        deadline = time.monotonic() + 2.0
+        while not buffer.network_manager.batches and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert buffer.network_manager.batches == [[{"id": "a", "action": "add"}]]
+    finally:
+        buffer.stop()
+
+class PartiallyFailingNetworkManager:
+    """
+    Fails the nodes in `down` the first time they are sent, like one controller shard being unreachable.
+    """
+
+    def __init__(self, down):
+        self.down = set(down)
+        self.batches = []
+
+    def manage_nodes(self, nodes):
+        failed = [node for node in nodes if node['id'] in self.down]
+        self.batches.append([node for node in nodes if node['id'] not in self.down])
+        self.down.clear()
+        if failed:
+            raise NodeManagementError("Network node management failed.", failed)
+
+def test_flush_requeues_only_failed_shards(make_config):
+    config = make_config({"node_updates": {"max_batch_size": 2, "retry_delay": 0}})
+    buffer = NodeUpdateBuffer(PartiallyFailingNetworkManager(down={"b"}), config)
+    buffer.submit_many([{"id": node_id, "action": "add"} for node_id in "abcd"])
+
+    assert buffer.flush() == 1
+    assert buffer.get_metrics()['pending'] == 3
+    assert buffer.flush() == 3
+    sent = [node['id'] for batch in buffer.network_manager.batches for node in batch]
+    assert sorted(sent) == ["a", "b", "c", "d"]
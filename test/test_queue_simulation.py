@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from algorithms.queue_simulation import QueueSimulator
+
+@pytest.fixture
+def make_simulator(make_config):
+    def make(**settings):
+        settings.setdefault("seed", 7)
+        return QueueSimulator(make_config({"resource_allocation": {"alpha": 0.1}, "queue_simulation": settings}))
+    return make
+
+@pytest.mark.parametrize("sampler", ["skellam", "poisson"])
+def test_mm1_mean_queue_length(make_simulator, sampler):
+    simulator = make_simulator(sampler=sampler, time_step=0.01)
+    # mu = alpha * R = 6, rho = 0.5, so the M/M/1 mean is rho / (1 - rho) = 1
+    results = simulator.simulate(np.full(100, 3.0), np.full(100, 60.0), num_steps=100000)
+    assert results['mean_queue_length'].mean() == pytest.approx(1.0, rel=0.05)
+    np.testing.assert_allclose(results['utilization'], 0.5)
+
+def test_overflow_events_are_counted(make_simulator):
+    simulator = make_simulator(buffer_size=20)
+    # Node 0 is far over capacity, node 1 nearly idle
+    results = simulator.simulate([20.0, 0.1], [20.0, 600.0], num_steps=20000)
+    # The unstable queue crosses the buffer once and never drains back
+    assert results['overflow_events'][0] == 1
+    assert results['overflow_events'][1] == 0
+    assert results['queue_length_percentiles'][99][0] == 21
+
+@pytest.mark.parametrize("sampler", ["skellam", "poisson"])
+def test_mmpp_keeps_mean_arrival_rate(make_simulator, sampler):
+    simulator = make_simulator(sampler=sampler, burstiness=0.8, switch_probability=0.05, time_step=0.01)
+    # With mu = 1 and lambda = 10 the queue never empties, so its final
+    # length is the net arrivals (lambda - mu) * T
+    num_steps = 20000
+    results = simulator.simulate(np.full(200, 10.0), np.full(200, 10.0), num_steps=num_steps)
+    expected = (10.0 - 1.0) * num_steps * 0.01
+    assert results['final_queue_length'].mean() == pytest.approx(expected, rel=0.02)
+
+def test_samplers_agree_on_bursty_queues(make_simulator):
+    arrival_rates, allocations = np.full(200, 4.0), np.full(200, 60.0)
+    means = [make_simulator(sampler=sampler, burstiness=0.5, seed=seed).simulate(arrival_rates, allocations, num_steps=20000)['mean_queue_length'].mean()
+             for sampler, seed in (("skellam", 1), ("poisson", 2))]
+    assert means[0] == pytest.approx(means[1], rel=0.1)
+
+def test_large_rates_fall_back_to_poisson(make_simulator):
+    simulator = make_simulator(time_step=1.0)
+    assert simulator._increment_table(np.array([500.0]), np.array([600.0])) is None
+    results = simulator.simulate([500.0], [6000.0], num_steps=1000)
+    assert results['mean_queue_length'][0] < 5
@@ -0,0 +1,156 @@
+import logging
+import time
+
+import pytest
+import requests
+
+from utils.resilience import CircuitOpenError, ControllerClient
+
+STATUS = '/network/status'
+
+@pytest.fixture
+def make_client(make_config):
+    def make(**resilience):
+        settings = {"timeouts": {STATUS: 1.0}, "hedge_min_samples": 5, "failure_threshold": 3, "reset_timeout": 0.3}
+        settings.update(resilience)
+        return ControllerClient(make_config({"resilience": settings}), logging.getLogger('test_resilience'))
+    return make
+
+def warm_up(client, stub, count=5):
+    for _ in range(count):
+        client.get_json(stub.base_url + STATUS)
+
+def test_timeout_fires_within_budget(stub, make_client):
+    client = make_client(timeouts={STATUS: 0.2}, hedge=False)
+    stub.latency = 1.0
+    start = time.monotonic()
+    with pytest.raises(requests.exceptions.Timeout):
+        client.get_json(stub.base_url + STATUS)
+    assert time.monotonic() - start < 0.5
+
+def test_hedge_is_sent_after_p95(stub, make_client):
+    client = make_client()
+    warm_up(client, stub)
+    assert len(stub.requests) == 5
+
+    stub.latency = 0.3
+    assert client.get_json(stub.base_url + STATUS) == {"status": "ok"}
+    # The primary outlived the fast p95, so a duplicate GET went out
+    assert len(stub.requests) == 7
+
+def test_no_hedge_before_enough_samples(stub, make_client):
+    client = make_client()
+    stub.latency = 0.1
+    client.get_json(stub.base_url + STATUS)
+    assert len(stub.requests) == 1
+
+def test_hedged_get_stays_within_budget(stub, make_client):
+    client = make_client(timeouts={STATUS: 0.3})
+    stub.latency = 0.1
+    warm_up(client, stub)
+
+    # The hedge fires after ~0.1s and must only get the remaining ~0.2s
+    stub.latency = 1.0
+    start = time.monotonic()
+    with pytest.raises(requests.exceptions.Timeout):
+        client.get_json(stub.base_url + STATUS)
+    assert time.monotonic() - start < 0.38
+
+def test_slow_hedged_get_counts_as_one_failure(stub, make_client):
+    client = make_client(timeouts={STATUS: 0.2})
+    warm_up(client, stub)
+    breaker = client.breaker_for(stub.base_url)
+
+    stub.latency = 1.0
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.Timeout):
+            client.get_json(stub.base_url + STATUS)
+    assert breaker.state == breaker.CLOSED
+
+    with pytest.raises(requests.exceptions.Timeout):
+        client.get_json(stub.base_url + STATUS)
+    assert breaker.state == breaker.OPEN
+
+def test_breaker_opens_serves_fallback_and_recovers(stub, make_client):
+    client = make_client(hedge=False)
+    url = stub.base_url + STATUS
+    breaker = client.breaker_for(url)
+    assert client.get_json(url, fallback=True) == {"status": "ok"}
+
+    stub.failure_rate = 1.0
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.get_json(url, fallback=True)
+    # The failure that opens the circuit is answered from the fallback
+    assert client.get_json(url, fallback=True) == {"status": "ok"}
+    assert breaker.state == breaker.OPEN
+
+    # While open, calls fail fast without reaching the controller
+    sent = len(stub.requests)
+    assert client.get_json(url, fallback=True) == {"status": "ok"}
+    with pytest.raises(CircuitOpenError):
+        client.get_json(url)
+    with pytest.raises(CircuitOpenError):
+        client.post(stub.base_url + '/flowtable', data='{}')
+    assert len(stub.requests) == sent
+
+    # After reset_timeout a half-open trial call closes it again
+    stub.failure_rate = 0.0
+    stub.responses[STATUS] = {"status": "recovered"}
+    time.sleep(0.35)
+    assert client.get_json(url, fallback=True) == {"status": "recovered"}
+    assert breaker.state == breaker.CLOSED
+
+def test_failed_half_open_trial_reopens(stub, make_client):
+    client = make_client(hedge=False, failure_threshold=1)
+    url = stub.base_url + STATUS
+    breaker = client.breaker_for(url)
+
+    stub.failure_rate = 1.0
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get_json(url)
+    assert breaker.state == breaker.OPEN
+
+    time.sleep(0.35)
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get_json(url)
+    assert breaker.state == breaker.OPEN
+
+def test_no_hedge_once_the_budget_is_spent(stub, make_client, monkeypatch):
+    client = make_client(timeouts={STATUS: 0.2})
+    url = stub.base_url + STATUS
+    warm_up(client, stub)
+
+    # A p95 equal to the budget leaves the hedge no time at all
+    monkeypatch.setattr(client.latency_for(url), 'percentile', lambda q: 0.2 - 1e-9)
+    stub.latency = 0.5
+    sent = len(stub.requests)
+    with pytest.raises(requests.exceptions.Timeout):
+        client.get_json(url)
+    time.sleep(0.6)
+    assert len(stub.requests) == sent + 1
+
+def test_unexpected_errors_end_the_half_open_trial(stub, make_client, monkeypatch):
+    client = make_client(hedge=False, failure_threshold=1)
+    url = stub.base_url + STATUS
+    breaker = client.breaker_for(url)
+
+    stub.failure_rate = 1.0
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get_json(url)
+    time.sleep(0.35)
+
+    def broken_send(*args, **kwargs):
+        raise ValueError("bad timeout")
+
+    monkeypatch.setattr(client, '_send', broken_send)
+    with pytest.raises(ValueError):
+        client.get_json(url)
+    assert breaker.state == breaker.OPEN
+
+    # The trial is over, so the next reset_timeout lets another one through
+    monkeypatch.undo()
+    stub.failure_rate = 0.0
+    time.sleep(0.35)
+    assert client.get_json(url) == {"status": "ok"}
+    assert breaker.state == breaker.CLOSED
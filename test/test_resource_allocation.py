@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+from scipy.optimize import check_grad
+
+from algorithms.delay_objective import delay_gradient, delay_objective, delay_sensitivity
+from algorithms.resource_allocation import ResourceAllocation
+from utils.state_bus import SharedStateBus
+
+@pytest.fixture
+def allocator(make_config):
+    return ResourceAllocation(make_config({"result_cache": {"enabled": False}}))
+
+@pytest.fixture
+def small_allocator(make_config):
+    # A budget of 10 keeps the delay gradients large enough for SLSQP to converge tightly
+    return ResourceAllocation(make_config({"result_cache": {"enabled": False},
+                                           "resource_allocation": {"total_resources": 10}}))
+
+def test_allocation_meets_budget_and_stability(allocator):
+    arrival_rates = np.random.default_rng(1).uniform(0.1, 0.4, 300)
+    allocations = allocator.allocate_resources(arrival_rates, np.ones(300))
+    assert np.sum(allocations) == pytest.approx(allocator.total_resources)
+    assert np.all(arrival_rates / (allocator.alpha * allocations) <= 1 + 1e-9)
+
+def test_allocation_sits_on_rho_bounds_when_they_use_the_whole_budget(allocator):
+    # sum(lambda_i / alpha) == T, so R_i = lambda_i / alpha is the only feasible point
+    allocations = allocator.allocate_resources([10, 20, 30, 40], [1, 2, 3, 4])
+    np.testing.assert_allclose(allocations, [100, 200, 300, 400], rtol=1e-4)
+
+def test_allocation_is_proportional_to_sqrt_of_rates_with_slack(small_allocator):
+    # Bounds lambda_i / alpha = [0.1, 0.4, 0.9, 1.6] are all slack at the optimum
+    allocations = small_allocator.allocate_resources([0.01, 0.04, 0.09, 0.16], [1, 2, 3, 4])
+    np.testing.assert_allclose(allocations, [1, 2, 3, 4], rtol=2e-3)
+
+def test_infeasible_rates_raise(allocator):
+    # Keeping every rho_i below 1 would need more than the total budget
+    with pytest.raises(ValueError):
+        allocator.allocate_resources([60, 60], [1, 1])
+
+def test_analytic_gradient_matches_finite_differences():
+    rng = np.random.default_rng(2)
+    arrival_rates = rng.uniform(1, 5, 10)
+    args = (arrival_rates, rng.integers(1, 4, 10), 0.1, 0.1, 0.1, 1000)
+    R = rng.uniform(50, 150, 10)
+    assert check_grad(delay_objective, delay_gradient, R, *args) < 1e-4
+
+def total_delay(arrival_rates, priority_levels, allocations, alpha=0.1, beta=0.1):
+    arrival_rates = np.asarray(arrival_rates, dtype=np.float64)
+    return np.sum(arrival_rates * (1.0 / (alpha * np.asarray(allocations)) + beta * np.asarray(priority_levels)))
+
+def test_delay_sensitivity():
+    np.testing.assert_allclose(delay_sensitivity([100, 200], [1, 2], 0.1, 0.1), [0.1 + 0.1, 0.05 + 0.2])
+
+def test_what_if_with_fixed_allocations_is_exact(allocator):
+    arrival_rates, priority_levels, allocations = [1, 4, 9, 16], [1, 2, 3, 4], [100, 200, 300, 400]
+    changes = allocator.delay_what_if(arrival_rates, priority_levels, allocations, [0, 3], [2.0, 5.0])
+    for node, increase, change in zip([0, 3], [2.0, 5.0], changes):
+        raised = np.array(arrival_rates, dtype=np.float64)
+        raised[node] += increase
+        expected = total_delay(raised, priority_levels, allocations) - total_delay(arrival_rates, priority_levels, allocations)
+        assert change == pytest.approx(expected)
+
+def test_what_if_with_reallocation_matches_resolving(small_allocator):
+    arrival_rates, priority_levels = [0.01, 0.04, 0.09, 0.16], [1, 2, 3, 4]
+    before = small_allocator.allocate_resources(arrival_rates, priority_levels)
+    change = small_allocator.delay_what_if(arrival_rates, priority_levels, before, [1], [0.05], reallocate=True)[0]
+
+    raised = [0.01, 0.09, 0.09, 0.16]
+    after = small_allocator.allocate_resources(raised, priority_levels)
+    expected = total_delay(raised, priority_levels, after) - total_delay(arrival_rates, priority_levels, before)
+    assert change == pytest.approx(expected, rel=1e-3)
+    # Re-optimizing can only do better than holding allocations fixed
+    assert change < small_allocator.delay_what_if(arrival_rates, priority_levels, before, [1], [0.05])[0]
+
+def test_what_if_with_reallocation_flags_bounds_and_infeasibility(small_allocator):
+    arrival_rates, priority_levels, allocations = [0.01, 0.04, 0.09, 0.16], [1, 2, 3, 4], [1, 2, 3, 4]
+    # +0.6 at node 3 makes its rho bound active, +10 exceeds the budget
+    changes = small_allocator.delay_what_if(arrival_rates, priority_levels, allocations, [0, 3, 2], [0.01, 0.6, 10.0],
+                                            reallocate=True)
+    assert np.isfinite(changes[0])
+    assert np.isnan(changes[1])
+    assert changes[2] == np.inf
+
+    # lambda = [0.1, 0.2, 0.3, 0.4] already needs the whole budget of 10
+    changes = small_allocator.delay_what_if([0.1, 0.2, 0.3, 0.4], priority_levels, allocations, [0, 1], [0.0, 0.05],
+                                            reallocate=True)
+    assert np.isnan(changes[0])
+    assert changes[1] == np.inf
+
+def test_allocate_from_state_bus_publishes_results(small_allocator):
+    bus = SharedStateBus.create(capacity=4)
+    try:
+        small_allocator.state_bus = bus
+        bus.write(arrival_rates=[0.01, 0.04, 0.09, 0.16])
+        allocations = small_allocator.allocate_from_state_bus([1, 2, 3, 4])
+        state = bus.read()
+        np.testing.assert_array_equal(state['allocations'], allocations)
+        np.testing.assert_allclose(state['traffic_intensities'], [0.01, 0.04, 0.09, 0.16] / (0.1 * allocations))
+    finally:
+        bus.close()
+        bus.unlink()
+
+def test_allocate_from_state_bus_requires_a_bus(allocator):
+    with pytest.raises(ValueError, match="state_bus"):
+        allocator.allocate_from_state_bus([1, 2])
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from algorithms.resource_allocation import ResourceAllocation
+from algorithms.result_cache import ResultCache
+from algorithms.stability_analysis import StabilityAnalysis
+
+ARRIVAL_RATES = [10, 20, 30, 40]
+PRIORITY_LEVELS = [1, 2, 3, 4]
+
+def test_repeated_allocation_hits_cache(make_config):
+    allocator = ResourceAllocation(make_config())
+    first = allocator.allocate_resources(ARRIVAL_RATES, PRIORITY_LEVELS)
+    second = allocator.allocate_resources(ARRIVAL_RATES, PRIORITY_LEVELS)
+    np.testing.assert_array_equal(first, second)
+    assert allocator.cache.get_stats()['hits'] == 1
+
+def test_config_update_invalidates_allocation_cache(make_config):
+    config = make_config()
+    allocator = ResourceAllocation(config)
+    allocator.allocate_resources(ARRIVAL_RATES, PRIORITY_LEVELS)
+
+    config.update_config({"resource_allocation": {"total_resources": 2000}})
+    updated = allocator.allocate_resources(ARRIVAL_RATES, PRIORITY_LEVELS)
+    fresh = ResourceAllocation(config).allocate_resources(ARRIVAL_RATES, PRIORITY_LEVELS)
+
+    assert np.sum(updated) == pytest.approx(2000)
+    np.testing.assert_allclose(updated, fresh)
+    stats = allocator.cache.get_stats()
+    assert stats['hits'] == 0
+    assert stats['invalidations'] == 1
+
+def test_config_update_invalidates_stability_cache(make_config):
+    config = make_config()
+    analyzer = StabilityAnalysis(config)
+    strategy = {"arrival_rates": ARRIVAL_RATES, "allocations": [150, 250, 350, 450]}
+    analyzer.analyze(strategy)
+
+    config.update_config({"stability_analysis": {"alpha": 0.2}})
+    analyzer.analyze(strategy)
+    assert analyzer.alpha == 0.2
+    assert analyzer.cache.get_stats()['invalidations'] == 1
+
+def test_quantized_inputs_share_a_key(make_config):
+    cache = ResultCache(make_config({"result_cache": {"quantum": 1e-3}}), 'test')
+    key, value = cache.lookup(([1.0, 2.0],), {"alpha": 0.1})
+    assert value is None
+    cache.store(key, 42)
+    assert cache.lookup(([1.0001, 2.0],), {"alpha": 0.1})[1] == 42
+
+def test_per_call_budget_does_not_invalidate_cache(make_config):
+    allocator = ResourceAllocation(make_config())
+    for _ in range(3):
+        default = allocator.allocate_resources(ARRIVAL_RATES, PRIORITY_LEVELS)
+        reduced = allocator.allocate_resources([1, 2], [1, 1], total_resources=50)
+    assert np.sum(default) == pytest.approx(1000)
+    assert np.sum(reduced) == pytest.approx(50)
+    stats = allocator.cache.get_stats()
+    assert stats['misses'] == 2
+    assert stats['hits'] == 4
+    assert stats['invalidations'] == 0
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from controllers.sdn_controller import SDNController
+from utils.state_bus import SharedStateBus
+
+def test_read_allocation_state_uses_zero_copy_views(make_config):
+    bus = SharedStateBus.create(capacity=4)
+    try:
+        controller = SDNController(make_config(), state_bus=bus)
+        bus.write(arrival_rates=[1.0, 2.0], allocations=[10.0, 40.0])
+
+        def utilization(arrival_rates, allocations):
+            assert not arrival_rates.flags.writeable
+            return {"rho": arrival_rates / (0.1 * allocations)}
+
+        state = controller.read_allocation_state(utilization, 'arrival_rates', 'allocations')
+        np.testing.assert_allclose(state['rho'], [1.0, 0.5])
+        assert state['versions'] == {"arrival_rates": 1, "allocations": 1}
+    finally:
+        bus.close()
+        bus.unlink()
+
+def test_read_allocation_state_requires_a_bus(make_config):
+    with pytest.raises(ValueError, match="state_bus"):
+        SDNController(make_config()).read_allocation_state(lambda **views: views)
@@ -0,0 +1,44 @@
+import subprocess
+import sys
+import uuid
+
+import numpy as np
+
+from conftest import SRC_DIR
+from utils.state_bus import SharedStateBus
+
+ATTACH_SCRIPT = """
+import sys
+sys.path.insert(0, sys.argv[2])
+from utils.state_bus import SharedStateBus
+bus = SharedStateBus.attach(sys.argv[1])
+print(','.join(str(v) for v in bus.read('arrival_rates')['arrival_rates']))
+bus.close()
+"""
+
+def test_attach_from_several_processes_does_not_unlink():
+    name = f"state_bus_test_{uuid.uuid4().hex[:8]}"
+    bus = SharedStateBus.create(name, capacity=4)
+    try:
+        bus.write(arrival_rates=[1.0, 2.0, 3.0])
+        for _ in range(2):
+            result = subprocess.run([sys.executable, '-c', ATTACH_SCRIPT, name, SRC_DIR],
+                                    capture_output=True, text=True, timeout=30)
+            assert result.returncode == 0, result.stderr
+            assert result.stdout.strip() == '1.0,2.0,3.0'
+            assert 'leaked' not in result.stderr
+    finally:
+        bus.close()
+        bus.unlink()
+
+def test_read_returns_written_values_and_versions():
+    bus = SharedStateBus.create(capacity=8)
+    try:
+        bus.write(arrival_rates=[1.0, 2.0], allocations=[10.0, 20.0])
+        state = bus.read('arrival_rates', 'allocations')
+        np.testing.assert_array_equal(state['arrival_rates'], [1.0, 2.0])
+        np.testing.assert_array_equal(state['allocations'], [10.0, 20.0])
+        assert state['versions'] == {'arrival_rates': 1, 'allocations': 1}
+    finally:
+        bus.close()
+        bus.unlink()
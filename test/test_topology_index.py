@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from network.topology_index import TopologyIndex
+
+# A - B - D is wide, A - C - D is narrow, and A - D is direct but narrowest
+TOPOLOGY = {
+    "switches": ["A", "B", "C", "D", "E"],
+    "links": [
+        {"source": "A", "destination": "B", "capacity": 10},
+        {"source": "B", "destination": "D", "capacity": 10},
+        {"source": "A", "destination": "C", "capacity": 4},
+        {"source": "C", "destination": "D", "capacity": 4},
+        {"source": "A", "destination": "D", "capacity": 1},
+    ]
+}
+
+@pytest.fixture
+def index():
+    return TopologyIndex(TOPOLOGY)
+
+def test_csr_arrays_match_links(index):
+    indptr, indices, weights, edges = index.csr()
+    assert index.num_nodes == 5
+    assert index.num_links == 10
+    assert len(indptr) == index.num_nodes + 1
+    assert indptr[-1] == len(indices) == len(weights) == len(edges)
+
+    neighbours = {}
+    for node in range(index.num_nodes):
+        for pos in range(indptr[node], indptr[node + 1]):
+            neighbours[(index.node_names[node], index.node_names[indices[pos]])] = weights[pos]
+    assert neighbours[("A", "B")] == pytest.approx(0.1)
+    assert neighbours[("D", "A")] == pytest.approx(1.0)
+    # E has no links
+    assert indptr[index.node_ids["E"]] == indptr[index.node_ids["E"] + 1]
+
+def test_shortest_paths_batch_matches_single_queries(index):
+    pairs = [("A", "D"), ("D", "A"), ("A", "C"), ("A", "E"), ("C", "B")]
+    paths = index.shortest_paths(pairs)
+    assert paths == [index.shortest_path(src, dst) for src, dst in pairs]
+    assert paths[0] == ["A", "B", "D"]
+    assert paths[1] == ["D", "B", "A"]
+    assert paths[3] is None
+
+def test_unknown_dpids_have_no_path(index):
+    assert index.shortest_paths([("A", "Z"), ("Z", "A")]) == [None, None]
+    assert index.shortest_path_avoiding("Z", "A", []) is None
+    assert index.k_shortest_paths("A", "Z", 3) == []
+    with pytest.raises(ValueError):
+        index.update_link_capacity("A", "Z", 5)
+
+def test_k_shortest_paths_are_loopless_and_ordered(index):
+    paths = index.k_shortest_paths("A", "D", 5)
+    # Only three loopless paths exist, so asking for five returns three
+    assert [path for _, path in paths] == [["A", "B", "D"], ["A", "C", "D"], ["A", "D"]]
+    assert [cost for cost, _ in paths] == pytest.approx([0.2, 0.5, 1.0])
+
+def test_remove_link_invalidates_cached_trees(index):
+    assert index.shortest_path("A", "D") == ["A", "B", "D"]
+    index.remove_link("B", "D")
+    assert index.shortest_path("A", "D") == ["A", "C", "D"]
+    assert index.num_links == 8
+
+def test_update_link_capacity_invalidates_cached_trees(index):
+    assert index.shortest_path("A", "D") == ["A", "B", "D"]
+    index.update_link_capacity("A", "B", 1)
+    assert index.shortest_path("A", "D") == ["A", "C", "D"]
+    index.update_link_capacity("A", "D", 100)
+    assert index.shortest_path("A", "D") == ["A", "D"]
+    assert np.min(index.csr()[2]) == pytest.approx(0.01)
+
+@pytest.mark.parametrize("capacity", [0, -1, None, float('nan'), "10"])
+def test_add_link_rejects_invalid_capacity(index, capacity):
+    with pytest.raises(ValueError):
+        index.add_link("A", "F", capacity=capacity)
+    assert "F" not in index.node_ids
+    with pytest.raises(ValueError):
+        index.update_link_capacity("A", "B", capacity)
+
+def test_update_link_capacity_checks_both_directions_first(index):
+    index.add_link("A", "E", capacity=5, bidirectional=False)
+    with pytest.raises(ValueError):
+        index.update_link_capacity("A", "E", 50)
+    assert index.k_shortest_paths("A", "E", 1)[0][0] == pytest.approx(0.2)